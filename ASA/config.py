@@ -3,6 +3,15 @@ inventory_close_attempts = 3
 
 teleporter_open_attempts = 3
 teleporter_close_attempts = 3
+teleport_verify_attempts = 2 # teleports to try when ccc says we didnt land at the station
+teleport_position_tolerance = 500 # max distance (unreal units) from the saved station position that still counts as arrived
+skip_same_location_teleport = True # dont open the teleporter when we are already standing on the target (only the yaw is set)
+teleport_step_timeouts = { # seconds each teleport step waits on its detector before giving up on it
+    "list_populated": 2,
+    "row_ready": 3,
+    "flash_start": 2,
+    "flash_end": 5,
+}
 
 tribelog_open_attempts = 100
 tribelog_close_attempts = 3
@@ -11,7 +20,36 @@ suicide_attempts = 3
 
 console_open_attempts = 3
 console_ccc_attempts = 3
+ccc_clipboard_timeout = 1.0 # seconds (times lag_offset) to wait for the ccc output to land on the clipboard
 
 buff_open_attempts = 10
 
-up_arrow = True  # TRUE OR FALSE
\ No newline at end of file
+# screen predicate memo (check_template results reused until the next input or until they go stale)
+memo_enabled = True
+memo_staleness = 0.25 # seconds a result from the current input epoch is reused for
+
+# recovery supervisor (close panels -> respawn -> reconnect -> relaunch)
+recovery_attempt_budget = 4 # rungs one incident may climb
+recovery_time_budget = 900 # seconds one incident may take before it gives up
+
+# player state cache (check_state only runs a single frame probe while the last full check is fresh)
+state_cache_ttl = 300 # seconds a full check_state is trusted for
+state_cache_timeout_invalidate = 5 # awaits with a timeout at least this long that run out invalidate the cache
+
+# hud vitals reader (food / water bars and the tekpod indicator read off the hud instead of the buff panel)
+hud_food_hsv = ((10, 120, 120), (30, 255, 255)) # lower / upper hsv of the filled part of the food bar
+hud_water_hsv = ((90, 120, 120), (110, 255, 255)) # lower / upper hsv of the filled part of the water bar
+hud_min_pixels = 20 # fewer matching pixels than this and the bar counts as unreadable
+hud_low_fraction = 0.25 # bar fill at or below this counts as starving / dehydrated
+hud_buff_panel_estimate = 3.0 # seconds a buff panel check is assumed to cost before one has been timed
+
+up_arrow = True  # TRUE OR FALSE
+
+# screen settle detection after transfer all / drop all clicks
+settle_stable_frames = 3 # frames in a row without change before the grid counts as settled
+settle_threshold = 1.5 # mean grey level difference between frames that still counts as unchanged
+settle_min_seconds = 0.05 # always wait at least this long after the click
+settle_change_seconds = 0.5 # times lag_offset, longest wait for the click to change anything (nothing to transfer / drop)
+settle_poll_seconds = 0.02
+
+slot_occupied_std = 18 # grey level spread above which an inventory slot counts as holding an item
@@ -15,6 +15,7 @@ import local_player
 region = template.roi_regions["access_inv"]
 def access_shoulder_mount():
     pyautogui.keyDown(chr(utils.keymap_return(local_player.get_input_settings("Reload"))))
+    windows.bump_epoch()
     # check for the location of the access_inv
     if template.template_await_true(template.check_template_no_bounds,1,"access_inv",0.7):
         x , y = template.return_location("access_inv",0.7) 
@@ -25,6 +26,7 @@ def access_shoulder_mount():
         windows.move_mouse(x+20,y+20)
         time.sleep(1)
         pyautogui.keyUp(chr(utils.keymap_return(local_player.get_input_settings("Reload"))))
+        windows.bump_epoch()
         
         if template.template_await_true(template.check_template,2,"inventory",0.7):
             logs.logger.debug(f"inventory opened")
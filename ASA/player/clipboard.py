@@ -0,0 +1,69 @@
+"""Clipboard access for the console.
+
+The game writes ccc output to the windows clipboard, the console pastes commands from it.
+Everything goes through `backend` so the console logic can run against the in-memory stand-in
+when win32clipboard isn't available (linux / tests).
+"""
+import time
+
+try:
+    import win32clipboard
+except ImportError:
+    win32clipboard = None
+
+
+class win32_backend():
+    def get_text(self):
+        win32clipboard.OpenClipboard()
+        try:
+            try:
+                return win32clipboard.GetClipboardData()
+            except TypeError: # clipboard holds nothing / non text data
+                return ""
+        finally:
+            win32clipboard.CloseClipboard()
+
+    def set_text(self, text: str):
+        win32clipboard.OpenClipboard()
+        try:
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardText(text, win32clipboard.CF_TEXT)
+        finally:
+            win32clipboard.CloseClipboard()
+
+
+class memory_backend():
+    def __init__(self, text: str = ""):
+        self.text = text
+
+    def get_text(self):
+        return self.text
+
+    def set_text(self, text: str):
+        self.text = text
+
+
+backend = win32_backend() if win32clipboard is not None else memory_backend()
+
+
+def get_text():
+    return backend.get_text()
+
+
+def set_text(text: str):
+    backend.set_text(text)
+
+
+def wait_for_change(snapshot, timeout: float, validate=None, poll: float = 0.02):
+    """
+    polls the clipboard until it holds something other than snapshot (and passes validate if given)
+    returns the new text or None once timeout runs out
+    """
+    deadline = time.time() + timeout
+    while True:
+        text = get_text()
+        if text != snapshot and (validate is None or validate(text)):
+            return text
+        if time.time() >= deadline:
+            return None
+        time.sleep(poll)
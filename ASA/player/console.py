@@ -5,80 +5,113 @@ import logs.gachalogs as logs
 import utils
 import windows
 import variables
-import time 
+import time
 import settings
-import ASA.config 
+import ASA.config
 import pyautogui
-import win32clipboard
+import ASA.player.clipboard as clipboard
+import ASA.player.location
+import ASA.player.state_cache
+import screen_monitor
 
 
 
 last_command = ""
+ccc_stats = {"calls": 0, "retries": 0, "failures": 0}
 
 def is_open():
+    monitored = screen_monitor.lookup("console")
+    if monitored is not None:
+        return monitored
     return template.console_strip_check(template.console_strip_bottom()) or template.console_strip_check(template.console_strip_middle())
 
 def enter_data(data:str):
-    global last_command
     if ASA.config.up_arrow and data == last_command:
         logs.logger.debug(f"using uparrow to put {data} into the console")
         pyautogui.press("up")
+        windows.bump_epoch()
     else:
         logs.logger.debug(f"using clipboard to put {data} into the console")
-        win32clipboard.OpenClipboard()
-        win32clipboard.EmptyClipboard()
-        win32clipboard.SetClipboardText( data, win32clipboard.CF_TEXT )
-        win32clipboard.CloseClipboard()
+        clipboard.set_text(data)
         pyautogui.hotkey("ctrl","v")
+        windows.bump_epoch()
+
+def submit(data:str, settle:float = 0.2):
+    """
+    puts data into the already open console and presses enter
+    last_command is only updated once enter has been pressed so the up arrow always recalls what the console history really has
+    """
+    global last_command
+    enter_data(data)
+    time.sleep(settle*settings.lag_offset)
+    utils.press_key("Enter")
     last_command = data
-    
-def console_ccc():
-    data = None
-    attempts = 0
-    while data == None:
-        attempts += 1
-        logs.logger.debug(f"trying to get ccc data {attempts} / {ASA.config.console_ccc_attempts}")
-        ASA.player.player_state.reset_state() #reset state at the start to make sure we can open up the console window
-        count = 0
-        while not is_open():
-            count += 1
-            utils.press_key("ConsoleKeys")
-            template.template_await_true(is_open,1)
-            if count >= ASA.config.console_open_attempts:
-                logs.logger.error(f"console didnt open after {count} attempts")
-                break
-        if is_open():
-            enter_data("ccc")
-            time.sleep(0.2*settings.lag_offset)
-            utils.press_key("Enter")
-            
-            time.sleep(0.1*settings.lag_offset) # slow to try and prevent opening clipboard to empty data
-            win32clipboard.OpenClipboard()
-            data = win32clipboard.GetClipboardData()
-            win32clipboard.CloseClipboard()
+    if data.strip().lower() == "reconnect":
+        ASA.player.location.invalidate("reconnect command")
+        ASA.player.state_cache.invalidate("reconnect command")
 
-        if attempts >= ASA.config.console_ccc_attempts:
-            logs.logger.error(f"CCC is still returning NONE after {attempts} attempts")
-            break        
-    if data != None:    
-        ccc_data = data.split()
-        return ccc_data
-    return data
+def parse_ccc(data):
+    """returns the ccc fields (x y z yaw pitch) if data looks like real ccc output otherwise None"""
+    if not data:
+        return None
+    fields = data.split()
+    if len(fields) < 5:
+        return None
+    try:
+        for field in fields[:5]:
+            float(field)
+    except ValueError:
+        return None
+    return fields
 
-def console_write(text:str):
+def submit_ccc():
+    """
+    runs ccc in the open console and waits for the game to put fresh output on the clipboard
+    the clipboard is snapshotted before enter so stale output from the last ccc is never accepted
+    """
+    snapshot = clipboard.get_text()
+    if parse_ccc(snapshot) is not None: # old ccc output would look valid, clear it so any valid text is new
+        clipboard.set_text("")
+        snapshot = ""
+    submit("ccc")
+    data = clipboard.wait_for_change(snapshot, ASA.config.ccc_clipboard_timeout*settings.lag_offset, parse_ccc)
+    return parse_ccc(data)
+
+def open_console():
     attempts = 0
     while not is_open():
         attempts += 1
         utils.press_key("ConsoleKeys")
         template.template_await_true(is_open,1)
         if attempts >= ASA.config.console_open_attempts:
-            logs.logger.error(f"console didnt open after {attempts} attempts unable to input {text}")
+            logs.logger.error(f"console didnt open after {attempts} attempts")
             break
+    return is_open()
 
-    if is_open():
-        enter_data(text)
-        time.sleep(0.1*settings.lag_offset)
-        utils.press_key("Enter")
-        
-        time.sleep(0.1*settings.lag_offset) # slow to try and prevent opening clipboard to empty data
-        
\ No newline at end of file
+def console_ccc():
+    ccc_data = None
+    attempts = 0
+    ccc_stats["calls"] += 1
+    while ccc_data == None:
+        attempts += 1
+        logs.logger.debug(f"trying to get ccc data {attempts} / {ASA.config.console_ccc_attempts}")
+        if attempts > 1:
+            ccc_stats["retries"] += 1
+        ASA.player.player_state.reset_state() #reset state at the start to make sure we can open up the console window
+        if open_console():
+            ccc_data = submit_ccc()
+
+        if ccc_data == None and attempts >= ASA.config.console_ccc_attempts:
+            logs.logger.error(f"CCC is still returning NONE after {attempts} attempts")
+            ccc_stats["failures"] += 1
+            break
+    if attempts > 1:
+        logs.logger.debug(f"ccc needed {attempts} attempts | {ccc_stats['retries']} retries over {ccc_stats['calls']} ccc calls")
+    return ccc_data
+
+def console_write(text:str):
+    if not open_console():
+        logs.logger.error(f"console isnt open unable to input {text}")
+        return
+    submit(text, 0.1)
+    time.sleep(0.1*settings.lag_offset) # slow to try and prevent opening clipboard to empty data
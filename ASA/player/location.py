@@ -0,0 +1,24 @@
+"""Last teleporter the player was confirmed to be standing on.
+
+Set by teleporter.teleport_not_default once a teleport has been verified and cleared whenever
+something could have moved the player without us knowing (death, reconnect, tekpod).
+"""
+import logs.gachalogs as logs
+
+current = None
+
+
+def set_current(teleporter_name: str):
+    global current
+    current = teleporter_name
+
+
+def invalidate(reason: str):
+    global current
+    if current is not None:
+        logs.logger.debug(f"forgetting current location {current}: {reason}")
+    current = None
+
+
+def is_at(teleporter_name: str) -> bool:
+    return current is not None and current == teleporter_name
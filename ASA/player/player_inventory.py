@@ -7,8 +7,15 @@ import time
 import settings
 import ASA.config 
 import ASA.player.player_state
+import screen_monitor
+import ASA.player.recovery
+import ASA.player.location
+import ASA.player.state_cache
 
 def is_open():
+    monitored = screen_monitor.lookup("inventory")
+    if monitored is not None:
+        return monitored
     return template.check_template("inventory",0.7)
     
 def open(): 
@@ -17,13 +24,14 @@ def open():
         attempts += 1
         logs.logger.debug(f"trying to open player inventory {attempts} / {ASA.config.inventory_open_attempts}")
         utils.press_key("ShowMyInventory")
-        if template.template_await_true(template.check_template,2,"inventory",0.7):
+        if template.template_await_true(template.check_template,2,"inventory",0.7,action="player_inventory_open"):
             logs.logger.debug("inventory opened")
             break
         
         #check state of the char before redoing
         if attempts >= ASA.config.inventory_open_attempts:
             logs.logger.error(f"unable to open up the players inventory")
+            ASA.player.state_cache.invalidate("player inventory didnt open")
             break
     time.sleep(0.3*settings.lag_offset)
 
@@ -33,7 +41,7 @@ def close():
         attempts += 1
         logs.logger.debug(f"trying to close objects inventory {attempts} / {ASA.config.inventory_close_attempts}")
         windows.click(variables.get_pixel_loc("close_inv_x"), variables.get_pixel_loc("close_inv_y"))
-        template.template_await_false(template.check_template,2,"inventory",0.7)
+        template.template_await_false(template.check_template,2,"inventory",0.7,action="inventory_close")
             
 
         if attempts >= ASA.config.inventory_close_attempts:
@@ -58,14 +66,14 @@ def drop_all_inv():
         logs.logger.debug(f"dropping all items from our inventory ")
         time.sleep(0.2*settings.lag_offset)
         windows.click(variables.get_pixel_loc("drop_all_x"),variables.get_pixel_loc("transfer_all_y")) 
-        time.sleep(0.1*settings.lag_offset)
+        template.await_settled("player_grid",2*settings.lag_offset,"drop_all_inv")
 
 def transfer_all_inventory(): 
     if is_open():
         logs.logger.debug(f"transfering all from our inventory into strucutre")
         time.sleep(0.2*settings.lag_offset)
         windows.click(variables.get_pixel_loc("transfer_all_inventory_x"),variables.get_pixel_loc("transfer_all_y"))
-        time.sleep(0.1*settings.lag_offset)
+        template.await_settled("player_grid",2*settings.lag_offset,"transfer_all_inventory")
 
 
 
@@ -82,12 +90,13 @@ def implant_eat():
         open()
         windows.move_mouse(variables.get_pixel_loc("implant_eat_x"),variables.get_pixel_loc("implant_eat_y"))
         windows.click(variables.get_pixel_loc("implant_eat_x"),variables.get_pixel_loc("implant_eat_y"))
+        ASA.player.location.invalidate("eating implant")
         time.sleep(10) # accounting for high ping lag
         utils.press_key("Use")
 
         if not template.template_await_true(template.check_template,10,"death_regions",0.7):
             #check state of the char before redoing
-            ASA.player.player_state.check_state()
+            ASA.player.recovery.recover("implant eat didnt kill the char")
             ...
                 
         if attempts >= ASA.config.suicide_attempts:
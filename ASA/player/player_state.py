@@ -10,21 +10,36 @@ import ASA.player.tribelog
 import ASA.strucutres.bed
 import ASA.strucutres.teleporter
 import ASA.player.player_inventory
-import ASA.player.buffs
+import ASA.player.vitals
 import bot.render
 import reconnect.start
 import local_player
+import ASA.player.location
+import ASA.player.state_cache
+import reconnect.recon_utils
+import screen
+import health_watcher
+
+def recover_connection(reason:str):
+    """gets the game back into the server from whatever state it is in (crashed, closed, disconnected)"""
+    logs.logger.critical(f"recovering the game connection: {reason}")
+    ASA.player.location.invalidate(reason)
+    ASA.player.state_cache.invalidate(reason)
+    with health_watcher.recovering():
+        rejoin = reconnect.start.reconnect(str(settings.server_number))
+        rejoin.rejoin_server() # only returns once the world has rendered back in
+        ASA.player.tribelog.close()
+        utils.set_yaw(settings.station_yaw)
 
 def check_disconnected():
+    if not health_watcher.is_healthy():
+        recover_connection(f"health watcher reports {health_watcher.status()['state']}")
+        return
     rejoin = reconnect.start.reconnect(str(settings.server_number))
     
     if rejoin.check_disconected():
         logs.logger.critical("we are disconnected from the server")
-        rejoin.rejoin_server()
-        ASA.player.tribelog.close()
-        logs.logger.critical("joined back into the server waiting 30 seconds to render everything ")
-        time.sleep(60)
-        utils.set_yaw(settings.station_yaw)
+        recover_connection("disconnected")
 
 def reset_state():
     logs.logger.debug(f"resetting char state now")
@@ -35,11 +50,37 @@ def reset_state():
         ASA.strucutres.bed.spawn_in(settings.bed_spawn) #guessing the char died will respawn it if the char hasnt died and it just in a tekpod screen it will just exit when it cant find its target bed
     utils.press_key("Run") # makes the char stand up doing this at the end ensures we arent in any inventory
 
+def cheap_probe() -> bool:
+    """one capture checked for anything that shouldnt be on screen between tasks, True when the screen looks clean"""
+    frame = screen.grab_client()
+    bounded = ((0,30,200),(255,255,255)) # same boundaries as check_template
+    no_bounds = ((0,0,0),(255,255,255)) # same boundaries as check_template_no_bounds
+    checks = [
+        (template.roi_regions["inventory"], "inventory", 0.7, bounded),
+        (template.roi_regions["teleporter_title"], "teleporter_title", 0.7, bounded),
+        (template.roi_regions["beds_title"], "beds_title", 0.7, bounded),
+        (template.roi_regions["tribelog_check"], "tribelog_check", 0.8, no_bounds),
+        (reconnect.recon_utils.location["escape"], "escape", 0.7, no_bounds),
+    ]
+    for region, item, threshold, (lower, upper) in checks:
+        if template.check_frame(frame, region, item, threshold, lower, upper):
+            logs.logger.debug(f"state probe found {item} on screen")
+            return False
+    return True
+
 def check_state(): # mainliy checked at the start of every task to check for food / water on the char
+    cache = ASA.player.state_cache
+    if cache.is_fresh() and not bot.render.render_flag:
+        cache.counters["cheap"] += 1
+        if cheap_probe():
+            logs.logger.debug(f"player state cache fresh skipping the full check | {cache.summary()}")
+            return
+        cache.counters["probe_failed"] += 1
+        cache.invalidate("state probe failed")
+    cache.counters["full"] += 1
     check_disconnected()
     reset_state()
-    buffs = ASA.player.buffs.check_buffs()
-    type = buffs.check_buffs()
+    type = ASA.player.vitals.check()
     if type == 1 or bot.render.render_flag: #type 1 is when char is in the tekpod
         logs.logger.debug(f"tekpod buff found on screen leaving tekpod now reason | type : {type} render flag : {bot.render.render_flag}")
         bot.render.leave_tekpod()
@@ -50,4 +91,5 @@ def check_state(): # mainliy checked at the start of every task to check for foo
         time.sleep(30) # assuming 30 seconds should replenish the player back to 100/100
         bot.render.leave_tekpod()
         time.sleep(1)
+    cache.mark_good()
 
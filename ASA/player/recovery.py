@@ -0,0 +1,120 @@
+"""Recovery supervisor for when an open / close keeps failing.
+
+The open and close helpers used to call player_state.check_state on failure, which called
+reset_state, which called the same helpers again. Under bad conditions that recursion multiplied
+captures and waits for minutes. Failures now call `recover(reason)` which walks an escalation ladder
+and stops at the first rung that leaves a clean screen:
+
+    close panels -> respawn (only when already dead / on the bed map) -> reconnect -> relaunch
+
+Nothing here kills the character: a missed open or close must not cost what it is carrying.
+
+Only one recovery runs at a time: anything that fails while a recovery is in progress (the close
+helpers inside the close panels rung for example) just returns instead of starting another one.
+Every incident is bounded by ASA.config.recovery_time_budget / recovery_attempt_budget and its cost
+is logged.
+"""
+import time
+from collections import deque
+
+import logs.gachalogs as logs
+import settings
+import utils
+import windows
+import ASA.config
+import ASA.player.player_state
+import ASA.player.player_inventory
+import ASA.player.tribelog
+import ASA.player.location
+import ASA.player.state_cache
+import ASA.strucutres.inventory
+import ASA.strucutres.teleporter
+import ASA.strucutres.bed
+import health_watcher
+from reconnect import crash
+
+_active = False
+incidents = deque(maxlen=50) # {"reason", "rung", "attempts", "seconds", "recovered"}
+
+
+def _close_panels():
+    ASA.player.player_inventory.close()
+    ASA.strucutres.teleporter.close()
+    ASA.player.tribelog.close()
+    if not ASA.strucutres.bed.is_dead(): # the death screen is left for the respawn rung
+        ASA.strucutres.bed.close()
+    utils.press_key("Run") # stands the char up if it got stuck crouched / in a pod exit animation
+
+
+def _respawn():
+    """spawns in if the char is already dead or on the bed map, returns False (rung skipped) for a living char"""
+    if not ASA.strucutres.bed.is_dead() and not ASA.strucutres.bed.is_open():
+        return False
+    ASA.strucutres.bed.spawn_in(settings.bed_spawn)
+
+
+def _reconnect():
+    ASA.player.player_state.recover_connection("recovery ladder")
+
+
+def _relaunch():
+    with health_watcher.recovering():
+        crash.crash(windows.hwnd).re_open_game()
+    ASA.player.player_state.recover_connection("relaunched by the recovery ladder")
+
+
+LADDER = [
+    ("close_panels", _close_panels),
+    ("respawn", _respawn),
+    ("reconnect", _reconnect),
+    ("relaunch", _relaunch),
+]
+
+
+def in_progress() -> bool:
+    return _active
+
+
+def _recovered() -> bool:
+    return health_watcher.is_healthy() and ASA.player.player_state.cheap_probe()
+
+
+def recover(reason: str) -> bool:
+    """walks the ladder until the screen is clean, returns True if it is. does nothing while another recovery is running"""
+    global _active
+    if _active:
+        logs.logger.debug(f"recovery already running ignoring nested request: {reason}")
+        return False
+    _active = True
+    start = time.time()
+    attempts = 0
+    rung = None
+    recovered = False
+    logs.logger.warning(f"recovery started: {reason}")
+    ASA.player.state_cache.invalidate(f"recovery: {reason}")
+    try:
+        for rung, action in LADDER:
+            if attempts >= ASA.config.recovery_attempt_budget or time.time() - start >= ASA.config.recovery_time_budget:
+                logs.logger.error(f"recovery budget spent after {attempts} rungs / {time.time() - start:.1f}s")
+                break
+            try:
+                if action() is False:
+                    logs.logger.debug(f"recovery rung {rung} doesnt apply skipping it")
+                    continue
+            except health_watcher.GameUnhealthyError as e: # game went down mid rung, the later rungs handle that
+                logs.logger.warning(f"recovery rung {rung} interrupted: {e}")
+            attempts += 1
+            logs.logger.debug(f"recovery rung {rung} done ({attempts}/{ASA.config.recovery_attempt_budget})")
+            if _recovered():
+                recovered = True
+                break
+    finally:
+        _active = False
+        seconds = time.time() - start
+        incidents.append({"reason": reason, "rung": rung, "attempts": attempts, "seconds": seconds, "recovered": recovered})
+        average = sum(entry["seconds"] for entry in incidents) / len(incidents)
+        log = logs.logger.warning if recovered else logs.logger.error
+        log(f"recovery {'finished' if recovered else 'failed'} at {rung} after {attempts} rungs in {seconds:.1f}s | average {average:.1f}s over {len(incidents)} incidents")
+        if recovered:
+            ASA.player.state_cache.mark_good()
+    return recovered
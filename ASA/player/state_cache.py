@@ -0,0 +1,41 @@
+"""Remembers when the player state was last fully checked.
+
+check_state does a disconnect check, a reset_state and a vitals check before every task. After a full
+check has passed the state is trusted for ASA.config.state_cache_ttl seconds and check_state only runs a
+single frame probe. Anything that could have put the player somewhere unexpected (death, reconnect,
+an open that failed, a long await timing out) invalidates it so the next check_state is a full one.
+"""
+import time
+
+import logs.gachalogs as logs
+import ASA.config
+
+verified_at = None
+counters = {"full": 0, "cheap": 0, "probe_failed": 0, "invalidations": 0}
+
+
+def mark_good():
+    global verified_at
+    verified_at = time.time()
+
+
+def invalidate(reason: str):
+    global verified_at
+    if verified_at is not None:
+        counters["invalidations"] += 1
+        logs.logger.debug(f"player state cache invalidated: {reason}")
+    verified_at = None
+
+
+def is_fresh() -> bool:
+    return verified_at is not None and time.time() - verified_at < ASA.config.state_cache_ttl
+
+
+def note_timeout(seconds: float, what: str = "await"):
+    """long waits that ran out usually mean the game isnt where we think it is"""
+    if seconds >= ASA.config.state_cache_timeout_invalidate:
+        invalidate(f"{what} timed out after {seconds}s")
+
+
+def summary() -> str:
+    return f"{counters['full']} full {counters['cheap']} cheap {counters['probe_failed']} probe failures {counters['invalidations']} invalidations"
@@ -8,8 +8,13 @@ import variables
 import time 
 import settings
 import ASA.config 
+import screen_monitor
+import ASA.player.recovery
 
 def is_open():
+    monitored = screen_monitor.lookup("tribelog")
+    if monitored is not None:
+        return monitored
     return template.check_template_no_bounds("tribelog_check",0.8)
     
 def open():
@@ -33,6 +38,5 @@ def close():
             
         if attempts >= ASA.config.inventory_close_attempts:
             logs.logger.error(f"unable to close the objects inventory after {attempts} attempts") 
-            #check state of the char the reason we can do it now is that the latter should spam click close inv 
-            ASA.player.player_state.check_state()
+            ASA.player.recovery.recover("tribelog wouldnt close")
             break
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""Food, water and tekpod state read straight off the HUD.
+
+The per task check used to open the player inventory and the buff panel every time. The HUD bars
+are always on screen so they are measured first and the buff panel (ASA.player.buffs) is only opened
+when the HUD can't be read (a menu covering it, an empty bar, no tek_pod_xp icon for the resolution,
+settings.hud_vitals_enabled off). The hud_food / hud_water regions are placeholders that have not
+been calibrated against real captures at any resolution, so the HUD read is not usable yet and is off
+by default.
+
+Results use the same codes as buffs.check_buffs so callers can swap one for the other:
+0 fine | 1 in tekpod | 2 dehydrated | 3 starving
+"""
+import time
+
+import template
+import logs.gachalogs as logs
+import settings
+import ASA.config
+import ASA.player.buffs
+import latency
+
+FINE = 0
+TEKPOD = 1
+DEHYDRATED = 2
+STARVING = 3
+
+stats = {"hud": 0, "fallback": 0, "saved": 0.0}
+
+
+def in_tekpod():
+    """None when there is no tek_pod_xp icon for this resolution, the buff panel has to decide then"""
+    if not template.has_icon("tek_pod_xp"):
+        return None
+    return template.check_template("tek_pod_xp",0.7)
+
+
+def read_hud():
+    """returns the state code from the hud or None when the bars cant be read"""
+    food = template.hud_bar_fill("hud_food",*ASA.config.hud_food_hsv,ASA.config.hud_min_pixels)
+    water = template.hud_bar_fill("hud_water",*ASA.config.hud_water_hsv,ASA.config.hud_min_pixels)
+    tekpod = in_tekpod()
+    if tekpod: # food and water dont matter in the pod, same order as the buff panel check
+        return TEKPOD
+    if tekpod is None or food is None or water is None:
+        return None
+    if water <= ASA.config.hud_low_fraction:
+        return DEHYDRATED
+    if food <= ASA.config.hud_low_fraction:
+        return STARVING
+    return FINE
+
+
+def _buff_panel():
+    start = time.time()
+    type = ASA.player.buffs.check_buffs().check_buffs()
+    latency.record("buff_panel_check", time.time() - start)
+    return type
+
+
+def _buff_panel_cost():
+    cost = latency.percentile("buff_panel_check",50)
+    return cost if cost is not None else ASA.config.hud_buff_panel_estimate
+
+
+def check():
+    """hud first then the buff panel, logs the seconds the hud read saved over opening the panel"""
+    if settings.hud_vitals_enabled:
+        start = time.time()
+        type = read_hud()
+        if type is not None:
+            saved = max(0.0, _buff_panel_cost() - (time.time() - start))
+            stats["hud"] += 1
+            stats["saved"] += saved
+            logs.logger.debug(f"hud vitals type:{type} saved {saved:.2f}s | {stats['saved']:.1f}s over {stats['hud']} hud reads {stats['fallback']} buff panel fallbacks")
+            return type
+        logs.logger.debug("hud vitals unreadable falling back to the buff panel")
+    stats["fallback"] += 1
+    return _buff_panel()
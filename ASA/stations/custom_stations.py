@@ -18,6 +18,10 @@ class station_metadata():
         self.side = None
         self.resource = None
 
+    def has_position(self):
+        """False when stations.json has no coordinates for this station yet (missing or left at 0 0 0)."""
+        return any(float(pos or 0) != 0 for pos in (self.xpos, self.ypos, self.zpos))
+
 
 def _json_load_relaxed(raw: str, file_path: str):
     raw = (raw or "").lstrip("\ufeff").strip()
@@ -36,10 +40,14 @@ def _json_load_relaxed(raw: str, file_path: str):
         return []
 
 
-def get_custom_stations():
+def _stations_path():
     # json_files lives at repo root: <repo>/json_files/stations.json
     base = Path(__file__).resolve().parents[2]
-    file_path = (base / "json_files" / "stations.json").resolve()
+    return (base / "json_files" / "stations.json").resolve()
+
+
+def get_custom_stations():
+    file_path = _stations_path()
 
     try:
         raw = file_path.read_text(encoding="utf-8")
@@ -79,3 +87,31 @@ def get_station_metadata(teleporter_name: str):
         stationdata.pitch = 0
 
     return stationdata
+
+
+def save_station_position(teleporter_name: str, xpos: float, ypos: float, zpos: float):
+    """Fill in the coordinates of a station in stations.json (adds the station if it isn't listed)."""
+    file_path = _stations_path()
+    try:
+        raw = file_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        raw = ""
+
+    all_stations = _json_load_relaxed(raw, str(file_path)) if raw.strip() else []
+    if raw.strip() and not all_stations:
+        logs.logger.error(f"not saving the position of {teleporter_name}: {file_path} could not be read")
+        return False
+
+    for entry_station in all_stations:
+        if entry_station.get("name") == teleporter_name:
+            entry_station["xpos"] = xpos
+            entry_station["ypos"] = ypos
+            entry_station["zpos"] = zpos
+            break
+    else:
+        # no yaw on purpose so the station keeps following settings.station_yaw
+        all_stations.append({"name": teleporter_name, "xpos": xpos, "ypos": ypos, "zpos": zpos})
+
+    file_path.write_text(json.dumps(all_stations, indent=4), encoding="utf-8")
+    logs.logger.info(f"saved position of {teleporter_name} to stations.json: {xpos} {ypos} {zpos}")
+    return True
@@ -9,11 +9,22 @@ import ASA.config
 import ASA.stations.custom_stations
 import ASA.player.tribelog
 import ASA.player.player_inventory
+import ASA.player.location
+import ASA.player.state_cache
+import screen_monitor
+
+on_respawn = [] # callbacks(reason) for things that are lost with the inventory, registered by the bot layer
 
 def is_open():
+    monitored = screen_monitor.lookup("bed")
+    if monitored is not None:
+        return monitored
     return template.check_template("beds_title",0.7) #bed title is found in both death and fast travel screens
     
 def is_dead():
+    monitored = screen_monitor.lookup("death")
+    if monitored is not None:
+        return monitored
     return template.check_template("death_regions",0.7)
     
 def close():
@@ -60,6 +71,10 @@ def spawn_in(bed_name:str):
             return
                
         windows.click(variables.get_pixel_loc("spawn_button_x"),variables.get_pixel_loc("spawn_button_y"))
+        ASA.player.location.invalidate(f"respawned at {bed_name}")
+        ASA.player.state_cache.invalidate(f"respawned at {bed_name}")
+        for callback in on_respawn:
+            callback(f"respawned at {bed_name}")
 
         if template.template_await_true(template.white_flash,2):
             logs.logger.debug(f"white flash detected waiting for up too 5 seconds")
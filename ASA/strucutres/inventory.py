@@ -9,12 +9,17 @@ import time
 import settings
 import ASA.config 
 import screen
+import screen_monitor
+import ASA.player.recovery
 inv_slots = { 
     "x" : 1660,
     "y" : 320,
     "distance" : 125
 }
 def is_open():
+    monitored = screen_monitor.lookup("inventory")
+    if monitored is not None:
+        return monitored
     return template.check_template("inventory",0.7)
 
 def auto_stack():
@@ -29,43 +34,51 @@ def auto_stack():
         logs.logger.error(f"auto_stack failed: {e}")
     return False
 
-    
+
+visible_slots = 6 * 7 # first page of the object inventory
+
+def occupied_slots() -> int:
+    """used slots on the first page of the open object inventory"""
+    return template.occupied_slots("object_grid", inv_slots["x"], inv_slots["y"], inv_slots["distance"], 6, 7, ASA.config.slot_occupied_std)
+
+def press_open(timeout:float = 2) -> bool:
+    """single AccessInventory press, True once the inventory is open and any remote inventory has finished loading"""
+    utils.press_key("AccessInventory")
+    if not template.template_await_true(template.check_template,timeout,"inventory",0.7,action="structure_inventory_open"):
+        return False
+    logs.logger.debug(f"inventory opened")
+    if template.template_await_true(template.check_template,1,"waiting_inv",0.8):
+        start = time.time()
+        logs.logger.debug(f"waiting for up too 10 seconds due to the reciving remote inventory is present")
+        template.template_await_false(template.check_template,10,"waiting_inv",0.8)
+        logs.logger.debug(f"{time.time() - start} seconds taken for the reciving remote inventory to go away")
+    return True
+
 def open():
     attempts = 0 
     while not is_open():
         attempts += 1
         logs.logger.debug(f"trying to open strucuture inventory {attempts} / {ASA.config.inventory_open_attempts}")
-        utils.press_key("AccessInventory")
-        if template.template_await_true(template.check_template,2,"inventory",0.7):
-            logs.logger.debug(f"inventory opened")
-            if template.template_await_true(template.check_template,1,"waiting_inv",0.8):
-                start = time.time()
-                logs.logger.debug(f"waiting for up too 10 seconds due to the reciving remote inventory is present")
-                template.template_await_false(template.check_template,10,"waiting_inv",0.8)
-                logs.logger.debug(f"{time.time() - start} seconds taken for the reciving remote inventory to go away")
-                break
-            
-        #check state of the char before redoing
-        else:
-            ASA.player.player_state.check_state()
+        if not press_open():
+            #check state of the char before redoing
+            ASA.player.recovery.recover("structure inventory didnt open")
         if attempts >= ASA.config.inventory_open_attempts:
             logs.logger.error(f"unable to open up the objects inventory")
             break
-    time.sleep(0.4*settings.lag_offset)    
+    time.sleep(0.4*settings.lag_offset)
 def close():
     attempts = 0
     while is_open():
         attempts += 1
         logs.logger.debug(f"trying to close objects inventory {attempts} / {ASA.config.inventory_close_attempts}")
         windows.click(variables.get_pixel_loc("close_inv_x"), variables.get_pixel_loc("close_inv_y"))
-        template.template_await_false(template.check_template,2,"inventory",0.7)
+        template.template_await_false(template.check_template,2,"inventory",0.7,action="inventory_close")
             
         if attempts >= ASA.config.inventory_close_attempts:
             logs.logger.error(f"unable to close the objects inventory after {attempts} attempts") 
-            #check state of the char the reason we can do it now is that the latter should spam click close inv 
-            ASA.player.player_state.check_state()
+            ASA.player.recovery.recover("structure inventory wouldnt close")
             break
-    time.sleep(0.4*settings.lag_offset)    
+    time.sleep(0.4*settings.lag_offset)
 #these functions assume that the inventory is already open
 def search_in_object(item:str): 
     if is_open():    
@@ -82,14 +95,14 @@ def drop_all_obj():
         logs.logger.debug(f"dropping all items from object")
         time.sleep(0.4*settings.lag_offset)
         windows.click(variables.get_pixel_loc("drop_all_obj_x"),variables.get_pixel_loc("transfer_all_y")) 
-        time.sleep(0.4*settings.lag_offset)
+        template.await_settled("object_grid",3*settings.lag_offset,"drop_all_obj")
 
 def transfer_all_from(): 
     if is_open():
         logs.logger.debug(f"transfering all from object")
         time.sleep(0.4*settings.lag_offset)
         windows.click(variables.get_pixel_loc("transfer_all_from_x"), variables.get_pixel_loc("transfer_all_y"))
-        time.sleep(0.4*settings.lag_offset)
+        template.await_settled("object_grid",3*settings.lag_offset,"transfer_all_from")
 
 
 
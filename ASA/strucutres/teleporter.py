@@ -9,8 +9,16 @@ import settings
 import ASA.config 
 import ASA.stations.custom_stations
 import ASA.player.tribelog
+import ASA.player.console
+import ASA.player.location
+import latency
+import screen_monitor
+import ASA.player.recovery
 
 def is_open():
+    monitored = screen_monitor.lookup("teleporter")
+    if monitored is not None:
+        return monitored
     return template.check_template("teleporter_title",0.7)
     
 def open():
@@ -23,10 +31,10 @@ def open():
         logs.logger.debug(f"trying to open teleporter {attempts} / {ASA.config.teleporter_open_attempts}")
         utils.press_key("Use")
     
-        if not template.template_await_true(template.check_template,2,"teleporter_title",0.7):
+        if not template.template_await_true(template.check_template,2,"teleporter_title",0.7,action="teleporter_open"):
             logs.logger.warning("teleporter didnt open retrying now")
-            ASA.player.player_state.check_state()
-            # check state of char which should close out of any windows we are in or rejoin the game
+            ASA.player.recovery.recover("teleporter didnt open")
+            # recovery closes out of any windows we are in or rejoins the game
             utils.pitch_zero() # reseting the chars pitch/yaw
             utils.turn_down(80)
             time.sleep(0.5*settings.lag_offset) 
@@ -56,54 +64,135 @@ def teleport_not_default(arg):
     else:
         stationdata = ASA.stations.custom_stations.get_station_metadata(arg)
 
-    teleporter_name = stationdata.name
-    time.sleep(0.5*settings.lag_offset)
+    if ASA.config.skip_same_location_teleport and ASA.player.location.is_at(stationdata.name):
+        ccc_data = ASA.player.console.console_ccc()
+        if verify_position(stationdata, ccc_data):
+            logs.logger.debug(f"already at {stationdata.name} skipping the teleporter and only resetting the view")
+            utils.pitch_zero(ccc_data) # the last station can leave us looking up or down, a teleport would have levelled this out
+            utils.set_yaw(stationdata.yaw, ccc_data)
+            return
+        ASA.player.location.invalidate(f"ccc says we are not at {stationdata.name}")
+
+    attempts = 0
+    while True:
+        attempts += 1
+        result = teleport_sequence(stationdata)
+        if result == ABORT:
+            ASA.player.location.invalidate("teleporter didnt open")
+            return
+        ccc_data = ASA.player.console.console_ccc()
+        verified = verify_position(stationdata, ccc_data, may_save=result == NEXT)
+        if verified:
+            ASA.player.location.set_current(stationdata.name)
+            break
+        if verified is None: # nothing to check against, carry on without trusting the location
+            ASA.player.location.invalidate(f"teleport to {stationdata.name} could not be verified")
+            break
+        if attempts >= ASA.config.teleport_verify_attempts:
+            logs.logger.error(f"still not at {stationdata.name} after {attempts} teleports continuing anyway")
+            ASA.player.location.invalidate("teleport could not be verified")
+            break
+        logs.logger.warning(f"not at {stationdata.name} after teleporting retrying the teleport {attempts} / {ASA.config.teleport_verify_attempts}")
+    utils.set_yaw(stationdata.yaw, ccc_data)
+
+def verify_position(stationdata, ccc_data, may_save:bool = False):
+    """
+    compares where ccc says we are with the coordinates saved for the station, None when it cant be checked
+    stations without saved coordinates get them filled in from this ccc, only when may_save (a teleport whose ui flow ran all the way through)
+    """
+    if ccc_data == None:
+        logs.logger.warning(f"no ccc data unable to verify we are at {stationdata.name}")
+        return None
+    x, y, z = (float(value) for value in ccc_data[:3])
+    if not stationdata.has_position():
+        if not may_save:
+            return None
+        ASA.stations.custom_stations.save_station_position(stationdata.name, round(x, 2), round(y, 2), round(z, 2))
+        stationdata.xpos, stationdata.ypos, stationdata.zpos = x, y, z
+        return True
+    distance = ((x - float(stationdata.xpos)) ** 2 + (y - float(stationdata.ypos)) ** 2 + (z - float(stationdata.zpos)) ** 2) ** 0.5
+    logs.logger.debug(f"{distance:.0f} units away from the saved position of {stationdata.name}")
+    return distance <= ASA.config.teleport_position_tolerance
+
+# every step of a teleport does its input and then moves on as soon as its detector fires (or its timeout runs out)
+# instead of sleeping a fixed amount. step results decide where the sequence goes next
+NEXT = "next" # carry on with the next step
+FINISH = "finish" # teleporter ui is done with, go straight to re-orientating
+ABORT = "abort" # teleporter never opened
+
+def _step_ui_open(stationdata):
     utils.turn_down(80)
-    time.sleep(0.5*settings.lag_offset)
-    open() 
-    time.sleep(0.5*settings.lag_offset) #waiting for teleport_icon to populate on the screen before we check
-    if is_open():
-        if template.teleport_icon(0.55):
-            start = time.time()
-            logs.logger.debug(f"teleport icons are not on the teleport screen waiting for up to 10 seconds for them to appear")
-            template.template_await_true(template.teleport_icon,10,0.55)
-            logs.logger.debug(f"time taken for teleporter icon to appear : {time.time() - start}")
-
-        windows.click(variables.get_pixel_loc("search_bar_bed_alive_x"),variables.get_pixel_loc("search_bar_bed_y")) #im lazy this is the same position as the teleporter search bar
-        utils.ctrl_a()
-        utils.write(teleporter_name)
-        time.sleep(0.5*settings.lag_offset)
-        windows.click(variables.get_pixel_loc("first_bed_slot_x"),variables.get_pixel_loc("first_bed_slot_y"))
-        time.sleep(0.5*settings.lag_offset) #preventing the orange text from the starting teleport screen messing things up
-        if not template.template_await_true(template.check_teleporter_orange,3):
-            logs.logger.warning(f"orange pixel for teleporter ready not found likely already on the tp we are just exiting the tp treating it as the tp we should be on")
-            close() # closing out as either the TP couldnt be found however we still want to change to the station yaw so we still continue
+    time.sleep(0.1*settings.lag_offset) # let the look down land before pressing use
+    open()
+    return NEXT if is_open() else ABORT
 
-        else:
-            time.sleep(0.5*settings.lag_offset)
-            windows.click(variables.get_pixel_loc("first_bed_slot_x"),variables.get_pixel_loc("first_bed_slot_y"))
-            time.sleep(0.5*settings.lag_offset)
-            windows.click(variables.get_pixel_loc("spawn_button_x"),variables.get_pixel_loc("spawn_button_y"))
-
-            if template.template_await_true(template.white_flash,2):
-                logs.logger.debug(f"white flash detected waiting for up too 5 seconds")
-                template.template_await_false(template.white_flash,5)
-            ASA.player.tribelog.open() 
-            ASA.player.tribelog.close()
-        time.sleep(0.5*settings.lag_offset)
-        if settings.singleplayer: # single player for some reason changes view angles when you tp 
-            utils.current_pitch = 0
-            utils.turn_down(80)
-            time.sleep(0.5)
-        utils.turn_up(80)
-        time.sleep(0.5) 
-        utils.set_yaw(stationdata.yaw)
-        
-            
+def _step_list_populated(stationdata):
+    # icons take a while to stream in on laggy servers, carry on regardless once the timeout runs out
+    if not template.template_await_true(template.teleport_icon,ASA.config.teleport_step_timeouts["list_populated"],0.55):
+        logs.logger.debug(f"teleporter icons didnt show up within {ASA.config.teleport_step_timeouts['list_populated']} seconds continuing anyway")
+    return NEXT
 
+def _step_row_ready(stationdata):
+    windows.click(variables.get_pixel_loc("search_bar_bed_alive_x"),variables.get_pixel_loc("search_bar_bed_y")) #im lazy this is the same position as the teleporter search bar
+    utils.ctrl_a()
+    utils.write(stationdata.name)
+    template.await_settled("teleporter_list",0.5*settings.lag_offset,"teleport_list_filter") # list is filtered once it stops changing
+    windows.click(variables.get_pixel_loc("first_bed_slot_x"),variables.get_pixel_loc("first_bed_slot_y"))
+    template.await_settled("teleporter_list",0.5*settings.lag_offset,"teleport_row_select") #preventing the orange text from the starting teleport screen messing things up
+    if not template.template_await_true(template.check_teleporter_orange,ASA.config.teleport_step_timeouts["row_ready"]):
+        logs.logger.warning(f"orange pixel for teleporter ready not found likely already on the tp we are just exiting the tp treating it as the tp we should be on")
+        close() # closing out as either the TP couldnt be found however we still want to change to the station yaw so we still continue
+        return FINISH
+    return NEXT
 
-                
-                              
+def _step_spawn(stationdata):
+    windows.click(variables.get_pixel_loc("first_bed_slot_x"),variables.get_pixel_loc("first_bed_slot_y"))
+    # the orange ready text is already up from row_ready so it cant tell us when spawn is clickable, wait for the spawn button
+    # to react to the row click instead (nothing changing there falls back to the old 0.5s pause)
+    template.await_settled("spawn_button",0.5*settings.lag_offset,"teleport_spawn_ready")
+    windows.click(variables.get_pixel_loc("spawn_button_x"),variables.get_pixel_loc("spawn_button_y"))
+    return NEXT
 
-                
-                
\ No newline at end of file
+def _step_flash(stationdata):
+    if template.template_await_true(template.white_flash,ASA.config.teleport_step_timeouts["flash_start"]):
+        logs.logger.debug(f"white flash detected waiting for up too {ASA.config.teleport_step_timeouts['flash_end']} seconds")
+        template.template_await_false(template.white_flash,ASA.config.teleport_step_timeouts["flash_end"])
+    return NEXT
+
+def _step_world_interactive(stationdata):
+    # the tribelog only opens once the world has loaded back in around us
+    ASA.player.tribelog.open()
+    ASA.player.tribelog.close()
+    return NEXT
+
+teleport_steps = [
+    ("ui_open", _step_ui_open),
+    ("list_populated", _step_list_populated),
+    ("row_ready", _step_row_ready),
+    ("spawn", _step_spawn),
+    ("flash", _step_flash),
+    ("world_interactive", _step_world_interactive),
+]
+
+def teleport_sequence(stationdata) -> str:
+    """runs the teleporter ui to get to stationdata, returns ABORT (never opened), FINISH (left the ui early) or NEXT (ran all the way through)"""
+    result = NEXT
+    for name, step in teleport_steps:
+        start = time.time()
+        result = step(stationdata)
+        latency.record(f"teleport_{name}", time.time() - start)
+        logs.logger.template(f"teleport step {name} -> {result} in {time.time() - start:.3f}s")
+        if result == ABORT:
+            return ABORT
+        if result == FINISH:
+            break
+
+    # no detector tells us the view has settled after a teleport, set_yaw / ccc straight after read a moving camera, so these keep the old settle waits
+    time.sleep(0.5*settings.lag_offset)
+    if settings.singleplayer: # single player for some reason changes view angles when you tp 
+        utils.current_pitch = 0
+        utils.turn_down(80)
+        time.sleep(0.5)
+    utils.turn_up(80)
+    time.sleep(0.5)
+    return result
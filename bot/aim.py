@@ -0,0 +1,86 @@
+"""Aim recovery for structures that don't open first try.
+
+The old retries were "zero, set_yaw via ccc, turn the same amount, try again" which costs a console
+round trip per retry and only ever retries the exact angle that just failed. acquire() instead
+walks a small spiral of yaw/pitch offsets around the learned correction (bot/aim_corrections.py)
+and only falls back to the console realign once the sweep is used up. The step sizes and the number
+of spiral points pressed come from bot.config.aim_profiles per structure type.
+"""
+import time
+
+import logs.gachalogs as logs
+import utils
+import settings
+import latency
+import ASA.strucutres.inventory
+import bot.config
+import bot.aim_corrections as aim_corrections
+
+_RING = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+def spiral(center: tuple, yaw_step: float, pitch_step: float, count: int) -> list:
+    """center first, then the nominal aim if the center is a learned offset, then rings of offsets around the center, count points in total"""
+    points = [center]
+    if center != (0, 0):
+        points.append((0, 0))
+    ring = 0
+    while len(points) < count:
+        ring += 1
+        for dyaw, dpitch in _RING:
+            points.append((center[0] + dyaw * ring * yaw_step, center[1] + dpitch * ring * pitch_step))
+    return points[:count]
+
+
+def acquire(metadata, target: str, structure: str, face, opened=None, attempts: int = None) -> tuple:
+    """
+    faces the structure with face() (the callers usual turn from the station yaw) and opens it
+    returns (accessed, offset) where offset is the (yaw, pitch) still applied on top of face(), callers undo it with aim_corrections.nudge(offset, (0, 0))
+    opened is the check for the right inventory (defaults to any structure inventory being open)
+    """
+    profile = bot.config.aim_profiles[structure]
+    attempts = profile["attempts"] if attempts is None else attempts
+    opened = opened or ASA.strucutres.inventory.is_open
+    sweep = profile["sweep"] if attempts > 1 else 1
+    points = spiral(aim_corrections.correction(metadata.name, target), profile["yaw_step"], profile["pitch_step"], sweep)
+    timeout = max(2.0, profile["timeout"]*settings.lag_offset) # never shorter than the old open wait, a late open would be closed by the next point
+    start = time.time()
+
+    face()
+    applied = (0, 0)
+    time.sleep(0.2*settings.lag_offset)
+    presses = 0
+    accessed = False
+    for point in points:
+        if ASA.strucutres.inventory.is_open(): # wrong inventory (dedi next to the grinder etc)
+            ASA.strucutres.inventory.close()
+        if point != applied:
+            applied = aim_corrections.nudge(applied, point)
+            time.sleep(bot.config.aim_settle)
+        presses += 1
+        if ASA.strucutres.inventory.press_open(timeout) and opened():
+            accessed = True
+            break
+
+    if not accessed and attempts > 1:
+        logs.logger.debug(f"{target} at {metadata.name} not found in the aim sweep realigning through the console")
+        if ASA.strucutres.inventory.is_open():
+            ASA.strucutres.inventory.close()
+        presses += 1
+        utils.zero()
+        utils.set_yaw(metadata.yaw)
+        face()
+        applied = aim_corrections.nudge((0, 0), points[0])
+        time.sleep(0.2*settings.lag_offset)
+        accessed = ASA.strucutres.inventory.press_open(timeout) and opened() # one press, recovery is left to the caller
+
+    if accessed:
+        aim_corrections.record_hit(metadata.name, target, applied, presses - 1)
+        time.sleep(0.4*settings.lag_offset)
+    else:
+        logs.logger.error(f"the {target} at {metadata.name} could not be accessed after {presses} attempts")
+        aim_corrections.record_miss(metadata.name, target)
+        if ASA.strucutres.inventory.is_open():
+            ASA.strucutres.inventory.close()
+    latency.record(f"aim_{structure}", time.time() - start)
+    return accessed, applied
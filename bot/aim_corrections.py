@@ -0,0 +1,103 @@
+"""Learned aim offsets per station and structure.
+
+Stations only store a nominal yaw in stations.json, when a structure doesn't open first try the
+old retries turned to exactly the same angle again. This keeps the (yaw, pitch) offset from the
+nominal aim that last led to a successful open for every station/target pair, tries it first on
+the next visit and saves it to json_files/aim_corrections.json so it survives restarts.
+
+Corrections fade towards zero with bot.config.aim_correction_half_life and are forgotten after
+aim_correction_max_age, a structure that got moved shouldn't keep the bot aiming at its old spot.
+"""
+import json
+import time
+from pathlib import Path
+
+import logs.gachalogs as logs
+import utils
+import bot.config
+
+_path = (Path(__file__).resolve().parents[1] / "json_files" / "aim_corrections.json")
+_corrections = None # "station|target" -> {"yaw", "pitch", "updated", "hits"}
+stats = {"visits": 0, "first_try": 0, "retries": 0}
+
+
+def _key(station: str, target: str) -> str:
+    return f"{station}|{target}"
+
+
+def _load() -> dict:
+    global _corrections
+    if _corrections is None:
+        try:
+            _corrections = json.loads(_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            _corrections = {}
+        except (json.JSONDecodeError, OSError) as e:
+            logs.logger.error(f"error loading aim corrections from {_path}: {e}")
+            _corrections = {}
+    return _corrections
+
+
+def _save():
+    try:
+        _path.write_text(json.dumps(_load(), indent=4), encoding="utf-8")
+    except OSError as e:
+        logs.logger.error(f"unable to save aim corrections to {_path}: {e}")
+
+
+def correction(station: str, target: str) -> tuple:
+    """decayed (yaw, pitch) offset for the target, (0, 0) if nothing usable has been learned"""
+    if not bot.config.aim_corrections_enabled:
+        return (0.0, 0.0)
+    entry = _load().get(_key(station, target))
+    if entry is None:
+        return (0.0, 0.0)
+    age = time.time() - entry["updated"]
+    if age > bot.config.aim_correction_max_age:
+        return (0.0, 0.0)
+    weight = 0.5 ** (age / bot.config.aim_correction_half_life)
+    return (entry["yaw"] * weight, entry["pitch"] * weight)
+
+
+def nudge(current: tuple, wanted: tuple) -> tuple:
+    """turns from one offset to another relative to wherever the caller is aiming, returns the new offset"""
+    utils.turn_by(wanted[0] - current[0], wanted[1] - current[1])
+    return wanted
+
+
+def record_hit(station: str, target: str, offset: tuple, retries: int):
+    stats["visits"] += 1
+    stats["retries"] += retries
+    if retries == 0:
+        stats["first_try"] += 1
+    corrections = _load()
+    key = _key(station, target)
+    entry = corrections.get(key)
+    learned = correction(station, target)
+    if entry is not None and retries == 0 and learned != (0.0, 0.0) and abs(learned[0] - offset[0]) < 0.01 and abs(learned[1] - offset[1]) < 0.01:
+        # the learned offset worked again, keep it as stored and restart its decay instead of storing the decayed value
+        entry["updated"] = time.time()
+        entry["hits"] = entry.get("hits", 0) + 1
+        if entry["hits"] % 10 == 0: # dont rewrite the file for every first try open
+            _save()
+        return
+    corrections[key] = {"yaw": round(offset[0], 2), "pitch": round(offset[1], 2), "updated": time.time(), "hits": (entry or {}).get("hits", 0) + 1}
+    if retries:
+        logs.logger.debug(f"{target} at {station} opened with offset yaw {offset[0]:.1f} pitch {offset[1]:.1f} after {retries} retries, using it first next visit")
+    _save()
+
+
+def record_miss(station: str, target: str):
+    """every offset failed, forget the correction so it cant keep pulling the aim off target"""
+    stats["visits"] += 1
+    if _load().pop(_key(station, target), None) is not None:
+        logs.logger.debug(f"dropping aim correction for {target} at {station} after a failed visit")
+        _save()
+
+
+def report():
+    if stats["visits"]:
+        logs.logger.info(
+            f"aim corrections: {stats['first_try']}/{stats['visits']} structures opened first try "
+            f"({stats['retries'] / stats['visits']:.2f} retries per visit)"
+        )
@@ -2,10 +2,47 @@ gacha_attempts = 3
 iguanadon_attempts = 3
 pego_attempts = 3
 grinder_attempts = 3 
-time_to_reberry = 2.3 # in hours
+time_to_reberry = 2.3 # in hours, longest a gacha goes between berry station visits (bot/seed_planner.py)
 render_attempts = 3
 
 # Attempts for added automated tasks
 sparkpowder_attempts = 3
 gunpowder_attempts = 3
 decay_prevention_attempts = 3
+
+# station circuit breaker (bot/station_health.py)
+station_failure_threshold = 3 # failed visits in a row before a station is quarantined
+station_backoff_base = 1800 # seconds before the first probe of a quarantined station
+station_backoff_max = 6*60*60 # backoff doubles per failed probe up to this
+
+# pego fill rate for settings.scheduler_mode = "edf" (bot/pego_fill.py)
+pego_capacity_slots = 42 # crystals a pego holds before it caps (one page of its inventory)
+pego_target_fill = 0.7 # pegos are requeued for when they should be this full
+pego_min_delay = 600 # seconds, never requeue a pego sooner than this
+pego_rate_smoothing = 0.3 # weight of the newest fill rate sample
+
+# deposit trip batching (bot/deposit_batch.py)
+deposit_batching = True
+player_weight_capacity = 400 # weight the player can carry before a pickup risks getting capped
+deposit_batch_fill = 0.8 # only batch another pickup while the estimate stays under this fraction of capacity
+pego_pickup_weight = 60 # estimated weight of the crystals from one pego
+snail_pickup_weight = 80 # estimated weight of one snail / pheonix collect
+deposit_batch_window = 300 # seconds, only wait for a pickup that is due this soon
+deposit_batch_max_hold = 1800 # seconds, never carry a batch longer than this
+
+# learned aim offsets (bot/aim_corrections.py)
+aim_corrections_enabled = True
+aim_correction_half_life = 3*24*60*60 # seconds for a learned offset to fade to half
+aim_correction_max_age = 14*24*60*60 # offsets older than this are ignored
+
+# aim sweep per structure type (bot/aim.py), steps in degrees between the spiral points around the learned offset
+# sweep is how many spiral points get an AccessInventory press, attempts above 1 adds a console realign after the sweep
+# (1 is a single press at the learned aim), timeout is the open wait per press before lag_offset (never below 2s)
+aim_profiles = {
+    "gacha": {"yaw_step": 3, "pitch_step": 3, "sweep": 6, "attempts": gacha_attempts, "timeout": 2.0},
+    "pego": {"yaw_step": 4, "pitch_step": 3, "sweep": 6, "attempts": pego_attempts, "timeout": 2.0},
+    "iguanadon": {"yaw_step": 4, "pitch_step": 4, "sweep": 6, "attempts": iguanadon_attempts, "timeout": 2.0},
+    "grinder": {"yaw_step": 3, "pitch_step": 2, "sweep": 4, "attempts": grinder_attempts, "timeout": 2.0},
+    "vault": {"yaw_step": 3, "pitch_step": 3, "sweep": 4, "attempts": 2, "timeout": 2.0},
+}
+aim_settle = 0.05 # seconds to let the view settle after each small turn before pressing
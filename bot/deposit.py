@@ -13,6 +13,8 @@ import ASA.config
 import ASA.strucutres.inventory
 import ASA.player.player_inventory
 import bot.config
+import bot.aim_corrections as aim_corrections
+import bot.aim as aim
 import json
 
 def load_resolution_data(file_path):
@@ -196,19 +198,9 @@ def vault_deposit(items, metadata):
         turn_constant = 2
     else:
         turn_constant = -1
-    utils.turn_right(90*turn_constant)
-    time.sleep(0.2*settings.lag_offset)
-    ASA.strucutres.inventory.open()
-    if not template.template_await_true(template.check_template,1,"vault",0.7):
-        logs.logger.error(f"{side} vault was not opened retrying now ")
-        ASA.strucutres.inventory.close()
-        time.sleep(0.1)
-        utils.set_yaw(metadata.yaw)
-        time.sleep(0.2)
-        utils.turn_right(90*turn_constant)
-        time.sleep(0.2*settings.lag_offset)
-        ASA.strucutres.inventory.open()
-    if template.template_await_true(template.check_template,1,"inventory",0.7):
+    opened = lambda: template.template_await_true(template.check_template,1,"vault",0.7)
+    accessed, applied = aim.acquire(metadata, f"vault_{side}", "vault", lambda: utils.turn_right(90*turn_constant), opened)
+    if accessed:
         time.sleep(0.1*settings.lag_offset)
         for x in range(len(items)):
             ASA.player.player_inventory.search_in_inventory(items[x])
@@ -216,6 +208,7 @@ def vault_deposit(items, metadata):
             time.sleep(0.3*settings.lag_offset)
         ASA.strucutres.inventory.close()
         time.sleep(0.2*settings.lag_offset)
+    aim_corrections.nudge(applied, (0, 0))
     utils.turn_left(90*turn_constant)
     time.sleep(0.2*settings.lag_offset)
 
@@ -227,24 +220,10 @@ def drop_useless():
     ASA.player.player_inventory.close()
 
 def depo_grinder(metadata):
-    utils.turn_right(180)
-    time.sleep(0.5*settings.lag_offset)
-    ASA.strucutres.inventory.open()
-    attempt = 0
-    while not template.template_await_true(template.check_template,1,"grinder",0.7):
-        attempt += 1
-        logs.logger.error("couldnt open up the grinder while trying to deposit")
-        ASA.strucutres.inventory.close()
-        utils.zero()
-        utils.set_yaw(metadata.yaw)
-        utils.turn_right(180)
-        time.sleep(0.5*settings.lag_offset)
-        ASA.strucutres.inventory.open()
-        if attempt >= bot.config.grinder_attempts:
-            logs.logger.error(f"while trying to deposit we couldnt access grinder")
-            break
+    opened = lambda: template.template_await_true(template.check_template,1,"grinder",0.7)
+    accessed, applied = aim.acquire(metadata, "grinder", "grinder", lambda: utils.turn_right(180), opened)
 
-    if template.check_template("grinder",0.7):
+    if accessed:
         ASA.player.player_inventory.transfer_all_inventory()
         time.sleep(0.3*settings.lag_offset)
         windows.click(variables.get_pixel_loc("dedi_withdraw_x"),variables.get_pixel_loc("dedi_withdraw_y")) #this is pressing the grind all button 
@@ -252,6 +231,7 @@ def depo_grinder(metadata):
         ASA.strucutres.inventory.close()
     template.template_await_false(template.check_template,1,"inventory",0.7)
     time.sleep(0.2*settings.lag_offset)
+    aim_corrections.nudge(applied, (0, 0))
     utils.turn_right(180)
 
 def collect_grindables(metadata):
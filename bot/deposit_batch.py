@@ -0,0 +1,98 @@
+"""Chains several pickups before one deposit trip.
+
+Every pego that found crystals used to make the full open crystals / dedi / vault / drop off trip
+straight away, and every snail/pheonix collect teleported to its depo. A pickup now only adds to
+what the player is carrying (estimated weight per pickup from bot.config) and the trip is deferred
+when the next due task is another pickup of the same kind, it is due within
+deposit_batch_window, the carried weight still has room for it and nothing has been held longer
+than deposit_batch_max_hold. The scheduler flushes whatever is pending before any task that would
+drop or deposit the inventory.
+"""
+import time
+
+import logs.gachalogs as logs
+import bot.config
+
+CRYSTALS = "crystals"
+
+_pending = {} # kind -> {"pickups", "weight", "since", "trip"}
+stats = {"pickups": 0, "trips": 0}
+
+
+def depo_kind(depo_tp) -> str:
+    return f"depo:{depo_tp}"
+
+
+def carried_weight() -> float:
+    return sum(entry["weight"] for entry in _pending.values())
+
+
+def pending(kind: str = None) -> bool:
+    return kind in _pending if kind is not None else bool(_pending)
+
+
+def add(kind: str, weight: float, trip):
+    """one pickup now in the players inventory, trip() is the deposit run that empties it"""
+    entry = _pending.setdefault(kind, {"pickups": 0, "weight": 0.0, "since": time.time(), "trip": trip})
+    entry["pickups"] += 1
+    entry["weight"] += weight
+    entry["trip"] = trip
+    stats["pickups"] += 1
+
+
+def should_defer(kind: str, next_due) -> bool:
+    """next_due is (task, seconds until due) of the next task the scheduler would run or None"""
+    if not bot.config.deposit_batching or kind not in _pending or next_due is None:
+        return False
+    entry = _pending[kind]
+    task, due_in = next_due
+    if getattr(task, "batch_kind", None) != kind:
+        return False
+    if due_in > bot.config.deposit_batch_window:
+        return False
+    if time.time() - entry["since"] > bot.config.deposit_batch_max_hold:
+        return False
+    if carried_weight() + getattr(task, "pickup_weight", 0) > bot.config.player_weight_capacity * bot.config.deposit_batch_fill:
+        return False
+    logs.logger.info(
+        f"holding {entry['pickups']} {kind} pickups ({carried_weight():.0f} weight) for {getattr(task, 'name', '<unnamed>')} due in {due_in:.0f}s"
+    )
+    return True
+
+
+def flush(kind: str = None, reason: str = ""):
+    """runs the deposit trip for kind (or everything pending), entries are only cleared once their trip returns"""
+    for name in [kind] if kind is not None else list(_pending):
+        entry = _pending.get(name)
+        if entry is None:
+            continue
+        logs.logger.info(f"deposit trip for {entry['pickups']} {name} pickups {reason}".rstrip())
+        entry["trip"]()
+        _pending.pop(name, None)
+        stats["trips"] += 1
+    report()
+
+
+def flush_for(task):
+    """before a task runs, deposit anything it would otherwise drop"""
+    if not _pending or getattr(task, "keeps_inventory", False):
+        return
+    keep = getattr(task, "batch_kind", None)
+    for kind in list(_pending):
+        if kind != keep:
+            flush(kind, f"before {getattr(task, 'name', '<unnamed>')}")
+
+
+def forget(reason: str):
+    """the inventory is gone (death / respawn), nothing left to deposit"""
+    if _pending:
+        logs.logger.warning(f"forgetting {sum(entry['pickups'] for entry in _pending.values())} batched pickups: {reason}")
+        _pending.clear()
+
+
+def report():
+    if stats["pickups"]:
+        logs.logger.info(
+            f"deposit trips: {stats['trips']} for {stats['pickups']} pickups "
+            f"({stats['trips'] / stats['pickups']:.2f} trips per pickup, 1.00 without batching)"
+        )
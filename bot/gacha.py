@@ -10,30 +10,27 @@ import ASA.config
 import ASA.strucutres.inventory
 import ASA.player.player_inventory
 import bot.config
+import bot.aim_corrections as aim_corrections
+import bot.aim as aim
     
-def drop_off(metadata): #drop off for 150 stacks of seeds
+def probe_access(metadata) -> bool:
+    """single open of the gacha without touching any items, used to check a quarantined station before bringing seeds"""
+    turn_constant = 1 if metadata.side == "right" else -1
+    opened, applied = aim.acquire(metadata, f"gacha_{metadata.side}", "gacha", lambda: utils.turn_right(40*turn_constant), attempts=1)
+    ASA.strucutres.inventory.close()
+    aim_corrections.nudge(applied, (0, 0))
+    utils.turn_left(40*turn_constant)
+    return opened
+
+def drop_off(metadata, attempts:int = None) -> bool: #drop off for 150 stacks of seeds returns False if the seeds couldnt be put in the gacha
+    attempts = bot.config.gacha_attempts if attempts is None else attempts
     direction = metadata.side
     if direction == "right":
         turn_constant = 1
     else:
         turn_constant = -1
 
-    utils.turn_right(40*turn_constant)
-    time.sleep(0.2*settings.lag_offset)
-    ASA.strucutres.inventory.open()
-
-    attempt = 0
-    while not ASA.strucutres.inventory.is_open():
-        attempt += 1
-        logs.logger.debug(f"the {direction} gacha at {metadata.name} could not be accessed retrying {attempt} / {bot.config.gacha_attempts}")
-        utils.zero()
-        utils.set_yaw(metadata.yaw)
-        utils.turn_right(40*turn_constant)
-        time.sleep(0.2*settings.lag_offset)
-        ASA.strucutres.inventory.open()
-        if attempt >= bot.config.gacha_attempts:
-            logs.logger.error(f"the {direction} gacha at {metadata.name} could not be accesssed after {attempt} attempts")
-            break
+    accessed, applied = aim.acquire(metadata, f"gacha_{direction}", "gacha", lambda: utils.turn_right(40*turn_constant), attempts=attempts)
     temp = False
     if ASA.strucutres.inventory.is_open():
         ASA.strucutres.inventory.transfer_all_from()
@@ -61,6 +58,7 @@ def drop_off(metadata): #drop off for 150 stacks of seeds
     time.sleep(0.2*settings.lag_offset)
     if temp:
         utils.turn_left(180)
+    aim_corrections.nudge(applied, (0, 0)) # the learned offset is for the gacha only, the crop plot uses the nominal aim
     utils.turn_right(90*turn_constant)
     time.sleep(0.3*settings.lag_offset)
     ASA.strucutres.inventory.open()
@@ -80,6 +78,7 @@ def drop_off(metadata): #drop off for 150 stacks of seeds
     time.sleep(0.2*settings.lag_offset)
 
     utils.turn_left(90*turn_constant)
+    aim_corrections.nudge((0, 0), applied) # back on the gacha, the seeds go in with the learned offset
     time.sleep(0.2*settings.lag_offset)
     ASA.strucutres.inventory.open()
     if template.check_template("crop_plot",0.7):
@@ -90,7 +89,8 @@ def drop_off(metadata): #drop off for 150 stacks of seeds
         time.sleep(0.3*settings.lag_offset)
         ASA.strucutres.inventory.open()
         time.sleep(0.3*settings.lag_offset)
-    if ASA.strucutres.inventory.is_open():
+    deposited = ASA.strucutres.inventory.is_open()
+    if deposited:
         ASA.player.player_inventory.search_in_inventory("seed")
         time.sleep(0.2*settings.lag_offset)
         ASA.player.player_inventory.transfer_all_inventory()
@@ -110,7 +110,9 @@ def drop_off(metadata): #drop off for 150 stacks of seeds
 
     ASA.strucutres.inventory.close()
     time.sleep(0.2*settings.lag_offset)
+    aim_corrections.nudge(applied, (0, 0))
     utils.turn_left(40*turn_constant)
+    return deposited
 
 def collection(metadata):
     direction = metadata.side
@@ -119,25 +121,12 @@ def collection(metadata):
     else:
         turn_constant = -1
 
-    utils.turn_right(40*turn_constant)
-    time.sleep(0.2*settings.lag_offset)
-    ASA.strucutres.inventory.open()
+    accessed, applied = aim.acquire(metadata, f"gacha_{direction}", "gacha", lambda: utils.turn_right(40*turn_constant))
 
-    attempt = 0
-    while not ASA.strucutres.inventory.is_open():
-        attempt += 1
-        logs.logger.debug(f"the {direction} gacha at {metadata.name} could not be accessed retrying {attempt} / {bot.config.gacha_attempts}")
-        utils.zero()
-        utils.set_yaw(metadata.side)
-        utils.turn_right(40*turn_constant)
-        time.sleep(0.2*settings.lag_offset)
-        ASA.strucutres.inventory.open()
-        if attempt >= bot.config.gacha_attempts:
-            logs.logger.error(f"the {direction} gacha at {metadata.name} could not be accesssed after {attempt} attempts")
-
-    if ASA.strucutres.inventory.is_open():
+    if accessed:
         ASA.strucutres.inventory.transfer_all_from()
     ASA.strucutres.inventory.close()
+    aim_corrections.nudge(applied, (0, 0))
     utils.turn_left(40*turn_constant)
 
 
@@ -10,6 +10,8 @@ import ASA.config
 import ASA.strucutres.inventory
 import ASA.player.player_inventory
 import bot.config
+import bot.aim_corrections as aim_corrections
+import bot.aim as aim
 
 def berry_collection():
     time.sleep(0.5)
@@ -38,6 +40,7 @@ def seed(type):
         ASA.player.player_inventory.close()
         time.sleep(0.1*settings.lag_offset)
 
+    seeded = True
     if not template.template_await_true(template.check_template,1,"seed_inv",0.7):
         logs.logger.debug("iguanadon seeding hasnt been spotted re adding berries")
         ASA.strucutres.inventory.open()
@@ -46,7 +49,7 @@ def seed(type):
         ASA.player.player_inventory.search_in_inventory(settings.berry_type)
         ASA.player.player_inventory.transfer_all_inventory()
         ASA.strucutres.inventory.close()
-        template.template_await_true(template.check_template,1,"seed_inv",0.7)
+        seeded = template.template_await_true(template.check_template,1,"seed_inv",0.7)
     utils.press_key("Use")
     time.sleep(0.6*settings.lag_offset)
     ASA.strucutres.inventory.open()
@@ -56,21 +59,12 @@ def seed(type):
         time.sleep(0.3*settings.lag_offset)
         ASA.strucutres.inventory.close()
     time.sleep(0.2*settings.lag_offset)
+    return seeded # False when even the refill from the iguanadon didnt start seeding (out of berries)
 
 def iguanadon_open(metadata):
-    attempt = 0
-    time.sleep(0.2*settings.lag_offset)
-    ASA.strucutres.inventory.open()
-    while not ASA.strucutres.inventory.is_open():
-        attempt += 1
-        logs.logger.debug(f"the iguanadon at {metadata.name} could not be accessed retrying {attempt} / {bot.config.iguanadon_attempts}")
-        utils.zero()
-        utils.set_yaw(metadata.yaw)
-        time.sleep(0.2*settings.lag_offset)
-        ASA.strucutres.inventory.open()
-        if attempt >= bot.config.iguanadon_attempts:
-            logs.logger.error(f"the iguanadon at {metadata.name} could not be accesssed after {attempt} attempts")
-            break
+    """returns the aim offset left applied, seed() reopens the iguanadon from the same spot so it is undone by iguanadon()"""
+    accessed, applied = aim.acquire(metadata, "iguanadon", "iguanadon", lambda: None)
+    return applied
     
 def drop_seeds():
     utils.press_key("Crouch")
@@ -106,12 +100,16 @@ def pickup_seeds():
         utils.press_key("Run")
 
 def iguanadon(metadata):
-    iguanadon_open(metadata)
+    applied = iguanadon_open(metadata)
     if settings.seeds_230:  
-        seed(1)
+        seeded = seed(1)
+        aim_corrections.nudge(applied, (0, 0))
         drop_seeds()
-        iguanadon_open(metadata)
-        seed(2)
+        applied = iguanadon_open(metadata)
+        seeded = seed(2) and seeded
+        aim_corrections.nudge(applied, (0, 0))
         pickup_seeds()
     else:
-        seed(2)
\ No newline at end of file
+        seeded = seed(2)
+        aim_corrections.nudge(applied, (0, 0))
+    return seeded
\ No newline at end of file
@@ -10,32 +10,25 @@ import ASA.config
 import ASA.strucutres.inventory
 import ASA.player.player_inventory
 import bot.config
+import bot.aim_corrections as aim_corrections
+import bot.aim as aim
+import bot.pego_fill as pego_fill
 
-def pego_pickup(metadata):
-    attempt = 0
-    utils.turn_up(15)
-    time.sleep(0.2*settings.lag_offset)
-    ASA.strucutres.inventory.open()
-    while not ASA.strucutres.inventory.is_open():
-        attempt += 1
-        logs.logger.debug(f"the pego at {metadata.name} could not be accessed retrying {attempt} / {bot.config.pego_attempts}")
-        utils.zero()
-        utils.set_yaw(metadata.yaw)
-        utils.turn_up(15)
-        time.sleep(0.2*settings.lag_offset)
-        ASA.strucutres.inventory.open()
-        if attempt >= bot.config.pego_attempts:
-            logs.logger.error(f"the pego at {metadata.name} could not be accesssed after {attempt} attempts")
-            break
-
-    if ASA.strucutres.inventory.is_open():# prevents pego being FLUNG
-        ASA.player.player_inventory.drop_all_inv()
-        time.sleep(0.2*settings.lag_offset)
+def pego_pickup(metadata, attempts:int = None, keep_inventory:bool = False) -> bool: # returns False if the pego couldnt be accessed
+    attempts = bot.config.pego_attempts if attempts is None else attempts
+    accessed, applied = aim.acquire(metadata, "pego", "pego", lambda: utils.turn_up(15), attempts=attempts)
+    if accessed:# prevents pego being FLUNG
+        found = ASA.strucutres.inventory.occupied_slots()
+        pego_fill.record(metadata.name, found, found >= ASA.strucutres.inventory.visible_slots)
+        if not keep_inventory: # batched crystals from earlier pegos are kept, the capacity model leaves room for this pickup
+            ASA.player.player_inventory.drop_all_inv()
+            time.sleep(0.2*settings.lag_offset)
         ASA.strucutres.inventory.transfer_all_from()
         time.sleep(0.2*settings.lag_offset)
         ASA.strucutres.inventory.close() 
         
     time.sleep(0.1*settings.lag_offset)
+    aim_corrections.nudge(applied, (0, applied[1])) # pitch is zeroed below, only the yaw offset needs undoing
     utils.turn_down(utils.current_pitch)
     time.sleep(0.1*settings.lag_offset)
         
\ No newline at end of file
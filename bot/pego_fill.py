@@ -0,0 +1,61 @@
+"""Pego fill rate model for deadline scheduling.
+
+Every pickup counts the occupied slots on the first page of the pego inventory before taking
+everything out. Crystals over time since the previous pickup gives a fill rate per pego (smoothed),
+and from that the time the pego hits bot.config.pego_capacity_slots is its deadline. With
+settings.scheduler_mode = "edf" the scheduler runs whatever has the earliest deadline and pegos are
+requeued for when they should be around pego_target_fill full instead of a fixed delay.
+"""
+import time
+
+import logs.gachalogs as logs
+import bot.config
+
+_pegos = {} # teleporter name -> {"last", "rate", "found", "capped"}
+
+
+def record(name: str, crystals: int, page_full: bool):
+    now = time.time()
+    entry = _pegos.setdefault(name, {"last": None, "rate": None, "found": 0, "capped": 0})
+    if entry["last"] is not None and now > entry["last"]:
+        rate = crystals / (now - entry["last"])
+        if page_full: # only a lower bound, the pego could have been full for a while
+            entry["capped"] += 1
+            rate = max(rate, (entry["rate"] or 0.0) * 1.5)
+        alpha = bot.config.pego_rate_smoothing
+        entry["rate"] = rate if entry["rate"] is None else entry["rate"] * (1 - alpha) + rate * alpha
+        logs.logger.debug(
+            f"pego {name} had {crystals}{'+' if page_full else ''} crystals after {(now - entry['last']) / 60:.0f} mins "
+            f"fill rate {entry['rate'] * 3600:.1f}/h"
+        )
+    entry["last"] = now
+    entry["found"] = crystals
+
+
+def seconds_to(name: str, fraction: float):
+    """seconds after the last pickup until the pego is fraction full, None without a learned rate"""
+    entry = _pegos.get(name)
+    if entry is None or not entry["rate"]:
+        return None
+    return bot.config.pego_capacity_slots * fraction / entry["rate"]
+
+
+def deadline(name: str, fallback: float) -> float:
+    """time the pego is estimated to cap, fallback when there is no rate yet"""
+    entry = _pegos.get(name)
+    full_in = seconds_to(name, 1.0)
+    if full_in is None or entry["last"] is None:
+        return fallback
+    return entry["last"] + full_in
+
+
+def requeue_delay(name: str, default: float) -> float:
+    """delay until the pego is about pego_target_fill full, never longer than the configured delay"""
+    target_in = seconds_to(name, bot.config.pego_target_fill)
+    if target_in is None:
+        return default
+    return max(bot.config.pego_min_delay, min(default, target_in))
+
+
+def summary() -> dict:
+    return {name: dict(entry) for name, entry in _pegos.items()}
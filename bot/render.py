@@ -11,6 +11,7 @@ import ASA.player.player_state
 import pyautogui
 import local_player
 import ASA.player.buffs
+import ASA.player.location
 global render_flag
 render_flag = False #starts as false as obviously we are not rendering anything
 
@@ -19,7 +20,7 @@ def is_open():
 
 def enter_tekpod():
     global render_flag
-    buffs = ASA.player.buffs.check_buffs()
+    ASA.player.location.invalidate("entering tekpod")
     attempts = 0 
     while not render_flag:
         attempts += 1
@@ -34,9 +35,11 @@ def enter_tekpod():
         utils.turn_down(15)
         time.sleep(0.3*settings.lag_offset)
         pyautogui.keyDown(chr(utils.keymap_return(local_player.get_input_settings("Use"))))
+        windows.bump_epoch()
         
         if not template.template_await_true(template.check_template_no_bounds,1,"bed_radical",0.6):
             pyautogui.keyUp(chr(utils.keymap_return(local_player.get_input_settings("Use"))))
+            windows.bump_epoch()
             time.sleep(0.5*settings.lag_offset)    
             utils.press_key(local_player.get_input_settings("Run")) 
             utils.zero()
@@ -44,6 +47,7 @@ def enter_tekpod():
             utils.turn_down(15)
             time.sleep(0.3*settings.lag_offset)
             pyautogui.keyDown(chr(utils.keymap_return(local_player.get_input_settings("Use"))))
+            windows.bump_epoch()
             time.sleep(0.5*settings.lag_offset)
 
         if template.template_await_true(template.check_template_no_bounds,1,"bed_radical",0.6):
@@ -51,9 +55,10 @@ def enter_tekpod():
             windows.move_mouse(variables.get_pixel_loc("radical_laydown_x"), variables.get_pixel_loc("radical_laydown_y"))
             time.sleep(0.5*settings.lag_offset)
             pyautogui.keyUp(chr(utils.keymap_return(local_player.get_input_settings("Use"))))
+            windows.bump_epoch()
             time.sleep(1)
 
-        if buffs.check_buffs() == 1:
+        if ASA.player.buffs.check_buffs().check_buffs() == 1: # tekpod detection stays on the tek_pod_buff icon which exists for every resolution
             logs.logger.critical(f"bot is now in the render pod rendering the station after {attempts} attempts")
             render_flag = True
             utils.current_pitch = 0 # resetting the pitch for when char leaves the tekpod
@@ -67,13 +72,13 @@ def enter_tekpod():
 
 def leave_tekpod():
     global render_flag
-    buffs = ASA.player.buffs.check_buffs()
+    ASA.player.location.invalidate("leaving tekpod")
     ASA.player.player_state.reset_state() 
     time.sleep(0.2*settings.lag_offset)
     utils.press_key(local_player.get_input_settings("Use"))
     time.sleep(1*settings.lag_offset)
     # If we're still in the tekpod after the first attempt, retry once.
-    if buffs.check_buffs() == 1:
+    if ASA.player.buffs.check_buffs().check_buffs() == 1:
         time.sleep(3)
         logs.logger.warning("bot didnt leave the tekpod first try we are retrying now")
         utils.press_key(local_player.get_input_settings("Use"))
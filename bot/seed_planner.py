@@ -0,0 +1,94 @@
+"""Berry and seed logistics for the gacha stations.
+
+gacha_station used to go to the berry station whenever the berry_station flag was set or
+time_to_reberry had run out, and to the iguanadon before every gacha. On top of that:
+
+- the berry station is visited straight away once a seeding comes up empty instead of waiting out
+  time_to_reberry. time_to_reberry stays the upper bound, berries left in the inventory after a
+  seeding are dropped by seed(2) so there is no stock to count across gachas
+- seeds still carried after a gacha couldn't take them are used by the next gacha instead of
+  being dropped by its seeding, the scheduler pulls that gacha forward so they don't sit around
+
+hub visits per gacha serviced are logged after every gacha.
+"""
+import time
+
+import logs.gachalogs as logs
+import bot.config
+
+berries_at = 0.0 # time of the last berry visit
+restock = False # the last seeding came up empty
+seeds_carried = False
+stats = {"gachas": 0, "berry_visits": 0, "iguanadon_visits": 0, "carried_over": 0}
+
+
+def need_berries(forced: bool) -> bool:
+    """forced is the old berry_station flag (start up / after the tekpod drop all)"""
+    if seeds_carried:
+        return False
+    if forced or restock:
+        return True
+    return time.time() - berries_at > bot.config.time_to_reberry*60*60
+
+
+def need_seeding() -> bool:
+    return not seeds_carried
+
+
+def record_berry_visit():
+    global berries_at, restock
+    berries_at = time.time()
+    restock = False
+    stats["berry_visits"] += 1
+
+
+def record_seeding(seeded: bool):
+    global restock, seeds_carried
+    stats["iguanadon_visits"] += 1
+    if seeded:
+        seeds_carried = True
+    else:
+        logs.logger.warning("iguanadon seeding came up empty, berries will be restocked on the next gacha")
+        restock = True
+
+
+def record_drop_off(deposited: bool, name: str):
+    """seeds are only used up once the gacha took them"""
+    global seeds_carried
+    stats["gachas"] += 1
+    if deposited:
+        seeds_carried = False
+    else:
+        logs.logger.info(f"{name} couldnt take its seeds, keeping them for the next gacha")
+    report()
+
+
+def use_carried(name: str) -> bool:
+    if seeds_carried:
+        stats["carried_over"] += 1
+        logs.logger.info(f"{name} using the seeds left over from the last gacha, skipping the berry station and iguanadon")
+    return seeds_carried
+
+
+def before_task(task):
+    """anything but a gacha (or a task that keeps the inventory) drops or deposits carried seeds"""
+    global seeds_carried
+    if seeds_carried and not getattr(task, "uses_seeds", False) and not getattr(task, "keeps_inventory", False):
+        logs.logger.debug(f"carried seeds will be dropped by {getattr(task, 'name', '<unnamed>')}")
+        seeds_carried = False
+
+
+def forget(reason: str):
+    """the inventory is gone (respawn), any carried seeds with it"""
+    global seeds_carried
+    if seeds_carried:
+        logs.logger.debug(f"forgetting carried seeds: {reason}")
+    seeds_carried = False
+
+
+def report():
+    if stats["gachas"]:
+        logs.logger.info(
+            f"hub visits per gacha: berry {stats['berry_visits'] / stats['gachas']:.2f} iguanadon {stats['iguanadon_visits'] / stats['gachas']:.2f} "
+            f"over {stats['gachas']} gachas ({stats['carried_over']} used carried seeds)"
+        )
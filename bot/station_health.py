@@ -0,0 +1,82 @@
+"""Per station health score and circuit breaker.
+
+A gacha or pego that can't be accessed used to cost its full retry budget every time it came round.
+Every visit now records a success or failure. After bot.config.station_failure_threshold failures in
+a row the breaker trips: the station is requeued with exponential backoff (station_backoff_base
+doubling up to station_backoff_max), one alert is raised, and when it next comes round it only gets
+a single cheap access probe. A successful probe reinstates it.
+"""
+import time
+
+import logs.gachalogs as logs
+import bot.config
+
+CLOSED = "closed" # healthy, runs normally
+OPEN = "open" # tripped, waiting out its backoff
+PROBING = "probing" # backoff over, next visit is a single attempt probe
+
+_stations = {}
+
+
+def _entry(name: str) -> dict:
+    return _stations.setdefault(name, {"score": 1.0, "consecutive": 0, "trips": 0, "state": CLOSED, "until": 0.0, "backoff": 0.0})
+
+
+def state(name: str) -> str:
+    entry = _entry(name)
+    if entry["state"] == OPEN and time.time() >= entry["until"]:
+        entry["state"] = PROBING
+    return entry["state"]
+
+
+def is_probing(name: str) -> bool:
+    return state(name) == PROBING
+
+
+def attempts(name: str, normal: int) -> int:
+    """retry budget for this visit, a probe only gets one go"""
+    return 1 if is_probing(name) else normal
+
+
+def record_success(name: str):
+    entry = _entry(name)
+    entry["score"] = entry["score"] * 0.7 + 0.3
+    entry["consecutive"] = 0
+    if entry["state"] != CLOSED:
+        logs.logger.warning(f"station {name} reinstated after probe succeeded ({entry['trips']} trips so far)")
+    entry["state"] = CLOSED
+    entry["backoff"] = 0.0
+
+
+def record_failure(name: str, reason: str = ""):
+    entry = _entry(name)
+    entry["score"] = entry["score"] * 0.7
+    entry["consecutive"] += 1
+    probing = entry["state"] == PROBING
+    if not probing and entry["consecutive"] < bot.config.station_failure_threshold:
+        logs.logger.debug(f"station {name} failure {entry['consecutive']}/{bot.config.station_failure_threshold} score {entry['score']:.2f}: {reason}")
+        return
+    first_trip = entry["state"] == CLOSED
+    entry["backoff"] = bot.config.station_backoff_base if first_trip else min(entry["backoff"] * 2, bot.config.station_backoff_max)
+    entry["state"] = OPEN
+    entry["until"] = time.time() + entry["backoff"]
+    entry["trips"] += 1
+    if first_trip: # one alert per outage, failed probes only log at debug
+        logs.logger.error(
+            f"station {name} quarantined after {entry['consecutive']} failures in a row ({reason}) "
+            f"retrying with a single probe in {entry['backoff'] / 60:.0f} mins, backing off up to {bot.config.station_backoff_max / 3600:.1f}h"
+        )
+    else:
+        logs.logger.debug(f"station {name} probe failed backing off {entry['backoff'] / 60:.0f} mins")
+
+
+def requeue_delay(name: str, normal: float) -> float:
+    """seconds until the station should run again, a quarantined station never comes back sooner than a healthy one would"""
+    entry = _entry(name)
+    if entry["state"] == OPEN:
+        return max(normal, entry["until"] - time.time())
+    return normal
+
+
+def summary() -> dict:
+    return {name: dict(entry) for name, entry in _stations.items()}
@@ -4,10 +4,11 @@ import template
 import logs.gachalogs as logs
 import bot.render
 import utils
+import health_watcher
 from ASA.strucutres import bed , teleporter , inventory
-from ASA.player import buffs , console , player_state , tribelog , player_inventory
+from ASA.player import buffs , console , player_state , tribelog , player_inventory , location
 from ASA.stations import custom_stations
-from bot import config , deposit , gacha , iguanadon , pego 
+from bot import config , deposit , gacha , iguanadon , pego , station_health , deposit_batch , seed_planner , pego_fill
 from crafting.ARB import megalab as megalab_crafting
 from abc import ABC ,abstractmethod
 global berry_station
@@ -15,10 +16,140 @@ global last_berry
 last_berry = 0
 berry_station = True
 
+bed.on_respawn.append(deposit_batch.forget) # respawning loses the inventory
+bed.on_respawn.append(seed_planner.forget)
+
+step_failures = {} # "[Label] step" -> failures, for the resumable crafting / decay tasks
+
+def face_station(meta):
+    utils.pitch_zero()
+    utils.set_yaw(meta.yaw)
+
+def require_megalab():
+    if not megalab_crafting.is_open_megalab():
+        raise RuntimeError("Megalab inventory is not open (template not detected).")
+
+def open_megalab_inventory(label):
+    # Open Megalab inventory, transfer existing items, then craft more
+    inventory.open()
+    if not template.template_await_true(template.check_template, 1, "megalab", 0.7):
+        logs.logger.warning(f"{label} Megalab template not detected after open; retrying once")
+        inventory.close()
+        time.sleep(0.25 * settings.lag_offset)
+        inventory.open()
+
+    if not template.template_await_true(template.check_template, 1, "megalab", 0.7):
+        raise RuntimeError("Unable to open Megalab inventory (template not detected).")
+
+def close_inventory_cleanup():
+    try:
+        inventory.close()
+    except Exception:
+        pass
+
+def crystal_deposit_trip():
+    """open crystals, dedi / vault the loot and drop off the rest, the deposit half of a pego run"""
+    open_crystals_metadata = custom_stations.get_station_metadata(settings.open_crystals)
+    dropoff_metadata = custom_stations.get_station_metadata(settings.drop_off)
+    teleporter.teleport_not_default(open_crystals_metadata)  # teleport to open crystals station
+    time.sleep(0.8)  # give HUD/hotbar a moment to load after TP
+    deposit.open_crystals()
+    time.sleep(0.2)
+    deposit.dedi_deposit_alt(settings.height_ele)
+    time.sleep(0.2)
+    utils.zero()
+    utils.set_yaw(open_crystals_metadata.yaw)
+    time.sleep(0.2)
+    deposit.vaults(open_crystals_metadata)
+    time.sleep(0.2)
+    teleporter.teleport_not_default(dropoff_metadata)
+    time.sleep(0.5)
+    deposit.deposit_all(dropoff_metadata)
+    time.sleep(0.2)
+
+def depo_trip(depo_tp):
+    teleporter.teleport_not_default(depo_tp)
+    time.sleep(0.2)
+    deposit.dedi_deposit(settings.height_ele)
+    time.sleep(0.2)
+
+class TaskPreempted(Exception):
+    """raised at a checkpoint when the scheduler wants the task to step aside, the task resumes from that checkpoint"""
+    def __init__(self, checkpoint):
+        super().__init__(f"preempted at {checkpoint}")
+        self.checkpoint = checkpoint
+
 class base_task(ABC):
+    keeps_inventory = False # True for tasks that never drop or deposit what the char is carrying (safe to run mid another task)
+    batch_kind = None # pickups of the same kind can be chained before one deposit trip (bot/deposit_batch.py)
+    pickup_weight = 0 # estimated weight a pickup adds to the players inventory
+
     def __init__(self):
         self.has_run_before = False
+        self.preempt_check = None # set by the scheduler, called at every checkpoint
+        self.next_due = lambda: None # set by the scheduler, (task, seconds until due) of what would run next
+        self.pull_forward = lambda match: None # set by the scheduler, runs the next waiting task match(task) accepts straight away
+        self.resume_from = None
         
+    def checkpoint(self, name, holding_items=False):
+        """
+        safe point between steps, the scheduler may preempt the task here
+        holding_items tells the scheduler the char is carrying things this task still needs so only keeps_inventory tasks may cut in
+        """
+        if self.preempt_check is not None and self.preempt_check(self, name, holding_items):
+            self.resume_from = name
+            raise TaskPreempted(name)
+
+    def run_steps(self, label, meta, steps, attempts_max, cleanup, retry_sleep=0.75):
+        """
+        runs steps [(name, func, reorient)] in order, a failed attempt resumes from the first step that didnt complete
+        reorient runs before a step that follows skipped (already done) steps to get the char back into position for it (e.g. reopening the megalab)
+        """
+        done = []
+        for attempt in range(1, attempts_max + 1):
+            current = None
+            try:
+                player_state.check_state()
+                if done and not location.is_at(meta.name) and "teleported" in done: # check_state took us away (food / death)
+                    done.remove("teleported")
+                skipped = False
+                for name, func, reorient in steps:
+                    if name in done:
+                        skipped = True
+                        continue
+                    current = name
+                    if skipped:
+                        logs.logger.info(f"{label} resuming at {name} (done: {', '.join(done)})")
+                        if reorient is not None:
+                            reorient()
+                        skipped = False
+                    func()
+                    done.append(name)
+                return True
+
+            except health_watcher.GameUnhealthyError:
+                raise
+            except Exception as e:
+                key = f"{label} {current}"
+                step_failures[key] = step_failures.get(key, 0) + 1
+                logs.logger.warning(f"{label} Attempt {attempt}/{attempts_max} failed at {current}: {e} | step failures {step_failures[key]}")
+
+                # Best-effort cleanup so the next attempt starts in a sane state.
+                cleanup()
+                try:
+                    face_station(meta)
+                except Exception:
+                    pass
+
+                time.sleep(retry_sleep * getattr(settings, "lag_offset", 1.0))
+
+        logs.logger.error(f"{label} Failed after {attempts_max} attempts; giving up until next schedule. | step failures {step_failures}")
+        return False
+
+    def resuming(self, name, order):
+        """True if step name was already done before the task got preempted"""
+        return self.resume_from is not None and order.index(name) < order.index(self.resume_from)
+
     @abstractmethod
     def execute(self):
         pass
@@ -32,7 +163,13 @@ class base_task(ABC):
     def mark_as_run(self):
         self.has_run_before = True
 
+    def get_deadline(self, exec_time):
+        """latest time the task should start (used by settings.scheduler_mode = "edf"), by default it can slip until its next run would be due"""
+        return exec_time + float(self.get_requeue_delay() or 0)
+
 class gacha_station(base_task):
+    uses_seeds = True
+
     def __init__(self,name,teleporter_name,direction):
         super().__init__()
         self.name = name
@@ -40,13 +177,17 @@ class gacha_station(base_task):
         self.direction = direction
 
 
+    steps = ["berry", "iguanadon", "drop_off"]
+
     def execute(self):
         player_state.check_state()
         global berry_station
         global last_berry
+        if self.resume_from is not None:
+            logs.logger.info(f"resuming {self.name} from {self.resume_from}")
         
         temp = False
-        time_between = time.time() - last_berry
+        carried = self.resume_from is None and seed_planner.use_carried(self.name)
 
         gacha_metadata = custom_stations.get_station_metadata(self.teleporter_name)
         gacha_metadata.side = self.direction
@@ -54,27 +195,48 @@ class gacha_station(base_task):
         berry_metadata = custom_stations.get_station_metadata(settings.berry_station)
         iguanadon_metadata = custom_stations.get_station_metadata(settings.iguanadon)
 
-        if (berry_station or time_between > config.time_to_reberry*60*60): # if time is greater than 4 hours since the last time you went to berry station 
-            teleporter.teleport_not_default(berry_metadata)                    # or if berry station is true( when you go to tekpod and drop all ) and the time between has been longer than 30 mins since youve last been 
+        if self.resume_from is None and station_health.is_probing(self.name): # quarantined, check the gacha opens before collecting seeds for it
+            teleporter.teleport_not_default(gacha_metadata)
+            if not gacha.probe_access(gacha_metadata):
+                station_health.record_failure(self.name, "probe could not open the gacha")
+                return
+            station_health.record_success(self.name)
+
+        self.checkpoint("berry", holding_items=carried or temp)
+        if not self.resuming("berry", self.steps) and seed_planner.need_berries(berry_station): # berry stock cant cover this seeding (or berry station is true when you go to tekpod and drop all)
+            teleporter.teleport_not_default(berry_metadata)
             if settings.external_berry: 
                 logs.logger.debug("sleeping for 20 seconds as external")
                 time.sleep(20)#letting station spawn in if you have to tp away
             iguanadon.berry_station()
             last_berry = time.time()
             berry_station = False
+            seed_planner.record_berry_visit()
             temp = True
         
-        teleporter.teleport_not_default(iguanadon_metadata) # iguanadon is a centeral tp
-        
-        if settings.external_berry and temp: # quick fix for level 1 bug
-            logs.logger.debug("reconnecting because of level 1 bug - you chose external berry will sleep for 60 seconds as a way to ensure that we are fully loaded in")
-            console.console_write("reconnect")
-            time.sleep(60) # takes a while for the reonnect to actually go into action
-
-        iguanadon.iguanadon(iguanadon_metadata)
+        self.checkpoint("iguanadon", holding_items=carried or temp) # berries picked up for the iguanadon are in the inventory
+        if not self.resuming("iguanadon", self.steps) and not carried:
+            teleporter.teleport_not_default(iguanadon_metadata) # iguanadon is a centeral tp
+            
+            if settings.external_berry and temp: # quick fix for level 1 bug
+                logs.logger.debug("reconnecting because of level 1 bug - you chose external berry will sleep for 60 seconds as a way to ensure that we are fully loaded in")
+                console.console_write("reconnect")
+                time.sleep(60) # takes a while for the reonnect to actually go into action
+
+            seed_planner.record_seeding(iguanadon.iguanadon(iguanadon_metadata))
+
+        self.checkpoint("drop_off", holding_items=True) # seeds for the gacha are in the inventory
         teleporter.teleport_not_default(gacha_metadata)
         time.sleep(0.2)
-        gacha.drop_off(gacha_metadata)
+        deposited = gacha.drop_off(gacha_metadata, station_health.attempts(self.name, config.gacha_attempts))
+        if deposited:
+            station_health.record_success(self.name)
+        else:
+            station_health.record_failure(self.name, "seeds could not be put in the gacha")
+        seed_planner.record_drop_off(deposited, self.name)
+        if seed_planner.seeds_carried: # run the next gacha now so the seeds get used before something drops them
+            self.pull_forward(lambda task: getattr(task, "uses_seeds", False) and task is not self)
+        self.resume_from = None
 
     def get_priority_level(self):
         # Shifted to keep room for crafting tasks between pego and gachas.
@@ -88,6 +250,9 @@ class gacha_station(base_task):
         return delay 
 
 class pego_station(base_task):
+    batch_kind = deposit_batch.CRYSTALS
+    pickup_weight = config.pego_pickup_weight
+
     def __init__(self,name,teleporter_name,delay):
         super().__init__()
         self.name = name
@@ -98,27 +263,17 @@ class pego_station(base_task):
         player_state.check_state()
         
         pego_metadata = custom_stations.get_station_metadata(self.teleporter_name)
-        dropoff_metadata = custom_stations.get_station_metadata(settings.drop_off)
 
         teleporter.teleport_not_default(pego_metadata)
-        pego.pego_pickup(pego_metadata)
+        holding = deposit_batch.pending(deposit_batch.CRYSTALS) # crystals from earlier pegos must not be dropped
+        if pego.pego_pickup(pego_metadata, station_health.attempts(self.name, config.pego_attempts), keep_inventory=holding):
+            station_health.record_success(self.name)
+        else:
+            station_health.record_failure(self.name, "pego could not be accessed")
         if template.check_template("crystal_in_hotbar",0.7):
-            open_crystals_metadata = custom_stations.get_station_metadata(settings.open_crystals)
-            teleporter.teleport_not_default(open_crystals_metadata)  # teleport to open crystals station
-            time.sleep(0.8)  # give HUD/hotbar a moment to load after TP
-            deposit.open_crystals()
-            time.sleep(0.2)
-            deposit.dedi_deposit_alt(settings.height_ele)
-            time.sleep(0.2)
-            utils.zero()
-            utils.set_yaw(open_crystals_metadata.yaw)
-            time.sleep(0.2)
-            deposit.vaults(open_crystals_metadata)
-            time.sleep(0.2)
-            teleporter.teleport_not_default(dropoff_metadata)
-            time.sleep(0.5)
-            deposit.deposit_all(dropoff_metadata)
-            time.sleep(0.2)
+            deposit_batch.add(deposit_batch.CRYSTALS, self.pickup_weight, crystal_deposit_trip)
+            if not deposit_batch.should_defer(deposit_batch.CRYSTALS, self.next_due()):
+                deposit_batch.flush(deposit_batch.CRYSTALS)
 
         else:
             logs.logger.info(f"bot has no crystals in hotbar we are skipping the deposit step")
@@ -127,7 +282,13 @@ class pego_station(base_task):
         return 2 # highest prio level as we cant have these get capped 
 
     def get_requeue_delay(self):
+        if settings.scheduler_mode == "edf": # come back when the pego should be pego_target_fill full
+            return pego_fill.requeue_delay(self.teleporter_name, self.delay)
         return self.delay # delay cannot be constant as stations can cover different amounts of space each |||| 2 stacks of berries to 1 crystal 4 gachas to 1 pego
+
+    def get_deadline(self, exec_time):
+        # estimated time the pego caps, without a fill rate yet it is due as soon as it is ready
+        return pego_fill.deadline(self.teleporter_name, exec_time)
     
     
 class sparkpowder_station(base_task):
@@ -145,91 +306,61 @@ class sparkpowder_station(base_task):
         self.deposit_height = deposit_height
         self.one_shot = False
     def execute(self):
-        attempts_max = int(getattr(config, "sparkpowder_attempts", 3) or 3)
-
-        for attempt in range(1, attempts_max + 1):
-            meta = None
-            try:
-                player_state.check_state()
-
-                # Gate by BOTH the global crafting toggle and the sparkpowder feature toggle.
-                if not getattr(settings, "crafting", False) or not getattr(settings, "sparkpowder_enabled", False):
-                    logs.logger.info("[Sparkpowder] Disabled in settings (crafting and/or sparkpowder_enabled); skipping.")
-                    return
-
-                meta = custom_stations.get_station_metadata(self.teleporter_name)
-                logs.logger.info(f"[Sparkpowder] Teleport -> Station: {self.teleporter_name}")
-                teleporter.teleport_not_default(meta)
-                time.sleep(0.5 * getattr(settings, "lag_offset", 1.0))
-
-                # Ensure pitch starts neutral
-                utils.pitch_zero()
-                time.sleep(0.15 * settings.lag_offset)
-
-                # Stations face the common yaw; Megalab.
-                utils.turn_right(getattr(settings, "sparkpowder_turn_degrees", 180))
-                time.sleep(0.25 * settings.lag_offset)
-
-                # Look up to face the Megalab
-                utils.turn_up(getattr(settings, "sparkpowder_look_degrees", 45))
-                time.sleep(0.25 * settings.lag_offset)
-
-                # Open Megalab inventory, transfer existing sparkpowder, then craft more
-                inventory.open()
-                if not template.template_await_true(template.check_template, 1, "megalab", 0.7):
-                    logs.logger.warning("[Sparkpowder] Megalab template not detected after open; retrying once")
-                    inventory.close()
-                    time.sleep(0.25 * settings.lag_offset)
-                    player_state.check_state()
-                    inventory.open()
-
-                if not template.template_await_true(template.check_template, 1, "megalab", 0.7):
-                    raise RuntimeError("Unable to open Megalab inventory (template not detected).")
-
-                ok = megalab_crafting.run_sparkpowder_cycle(
-                    craft_seconds=getattr(settings, "sparkpowder_craft_seconds", 2.0)
-                )
-                if not ok:
-                    raise RuntimeError("Sparkpowder craft cycle failed (megalab helper returned False).")
-
-                inventory.close()
-                time.sleep(0.25 * settings.lag_offset)
-
-                # Return pitch back to neutral (we looked up earlier)
-                utils.turn_down(getattr(settings, "sparkpowder_look_degrees", 45))
-                time.sleep(0.25 * settings.lag_offset)
-
-                # Restore station-facing yaw + neutral pitch so the next task doesn't start misaligned
-                utils.pitch_zero()
-                utils.set_yaw(meta.yaw)
-
-                # Deposit to the station's dedicated storage boxes
-                deposit.dedi_deposit_custom_1(self.deposit_height)
-                time.sleep(0.25 * settings.lag_offset)
-
-                # Restore station-facing yaw + neutral pitch so the next task doesn't start misaligned
-                utils.pitch_zero()
-                utils.set_yaw(meta.yaw)
-                return
-
-            except Exception as e:
-                logs.logger.warning(f"[Sparkpowder] Attempt {attempt}/{attempts_max} failed: {e}")
-
-                # Best-effort cleanup so the next attempt starts in a sane state.
-                try:
-                    inventory.close()
-                except Exception:
-                    pass
-                try:
-                    if meta is not None:
-                        utils.pitch_zero()
-                        utils.set_yaw(meta.yaw)
-                except Exception:
-                    pass
-
-                time.sleep(0.75 * getattr(settings, "lag_offset", 1.0))
-
-        logs.logger.error(f"[Sparkpowder] Failed after {attempts_max} attempts; giving up until next schedule.")
+        # Gate by BOTH the global crafting toggle and the sparkpowder feature toggle.
+        if not getattr(settings, "crafting", False) or not getattr(settings, "sparkpowder_enabled", False):
+            logs.logger.info("[Sparkpowder] Disabled in settings (crafting and/or sparkpowder_enabled); skipping.")
+            return
+
+        meta = custom_stations.get_station_metadata(self.teleporter_name)
+        look_deg = getattr(settings, "sparkpowder_look_degrees", 45)
+
+        def teleport():
+            logs.logger.info(f"[Sparkpowder] Teleport -> Station: {self.teleporter_name}")
+            teleporter.teleport_not_default(meta)
+            time.sleep(0.5 * getattr(settings, "lag_offset", 1.0))
+
+        def open_megalab():
+            # Ensure pitch starts neutral
+            face_station(meta)
+            time.sleep(0.15 * settings.lag_offset)
+
+            # Stations face the common yaw; Megalab.
+            utils.turn_right(getattr(settings, "sparkpowder_turn_degrees", 180))
+            time.sleep(0.25 * settings.lag_offset)
+
+            # Look up to face the Megalab
+            utils.turn_up(look_deg)
+            time.sleep(0.25 * settings.lag_offset)
+            open_megalab_inventory("[Sparkpowder]")
+
+        def transfer():
+            require_megalab()
+            megalab_crafting.transfer_filtered_to_player("spark")
+
+        def craft():
+            require_megalab()
+            megalab_crafting.craft_from_crafting_tab("spark", craft_seconds=getattr(settings, "sparkpowder_craft_seconds", 2.0))
+
+        def deposit_step():
+            inventory.close()
+            time.sleep(0.25 * settings.lag_offset)
+
+            # Restore station-facing yaw + neutral pitch so the next task doesn't start misaligned
+            face_station(meta)
+
+            # Deposit to the station's dedicated storage boxes
+            deposit.dedi_deposit_custom_1(self.deposit_height)
+            time.sleep(0.25 * settings.lag_offset)
+            face_station(meta)
+
+        steps = [
+            ("teleported", teleport, None),
+            ("opened_megalab", open_megalab, None),
+            ("transferred", transfer, open_megalab), # resuming here needs the megalab open again
+            ("crafted", craft, open_megalab),
+            ("deposited", deposit_step, None),
+        ]
+        self.run_steps("[Sparkpowder]", meta, steps, int(getattr(config, "sparkpowder_attempts", 3) or 3), close_inventory_cleanup)
 
 
     def get_priority_level(self):
@@ -258,94 +389,64 @@ class gunpowder_station(base_task):
         self.deposit_height = deposit_height
         self.one_shot = False
     def execute(self):
-        attempts_max = int(getattr(config, "gunpowder_attempts", 3) or 3)
-
-        for attempt in range(1, attempts_max + 1):
-            meta = None
-            try:
-                player_state.check_state()
-
-                # Gate by BOTH the global crafting toggle and the gunpowder feature toggle.
-                if not getattr(settings, "crafting", False) or not getattr(settings, "gunpowder_enabled", False):
-                    logs.logger.info("[Gunpowder] Disabled in settings (crafting and/or gunpowder_enabled); skipping.")
-                    return
-
-                meta = custom_stations.get_station_metadata(self.teleporter_name)
-                logs.logger.info(f"[Gunpowder] Teleport -> Station: {self.teleporter_name}")
-                teleporter.teleport_not_default(meta)
-                time.sleep(0.5 * getattr(settings, "lag_offset", 1.0))
-
-                # Ensure pitch starts neutral before we do our look-up/down offsets
-                utils.pitch_zero()
-                time.sleep(0.15 * settings.lag_offset)
-
-                # Look down to face the Megalab
-                look_deg = abs(float(getattr(settings, "gunpowder_look_degrees", 25.0)))
-                utils.turn_down(look_deg)
-                time.sleep(0.25 * settings.lag_offset)
-
-                # Open Megalab inventory, transfer existing gunpowder, then craft more
-                inventory.open()
-                if not template.template_await_true(template.check_template, 1, "megalab", 0.7):
-                    logs.logger.warning("[Gunpowder] Megalab template not detected after open; retrying once")
-                    inventory.close()
-                    time.sleep(0.25 * settings.lag_offset)
-                    player_state.check_state()
-                    inventory.open()
-
-                if not template.template_await_true(template.check_template, 1, "megalab", 0.7):
-                    raise RuntimeError("Unable to open Megalab inventory (template not detected).")
-
-                ok = megalab_crafting.run_gunpowder_cycle(
-                    craft_seconds=getattr(settings, "gunpowder_craft_seconds", 2.0)
-                )
-                if not ok:
-                    raise RuntimeError("Gunpowder craft cycle failed (megalab helper returned False).")
-
-                inventory.close()
-                time.sleep(0.25 * settings.lag_offset)
-
-                # Return pitch back to neutral (we looked down earlier)
-                utils.turn_up(look_deg)
+        # Gate by BOTH the global crafting toggle and the gunpowder feature toggle.
+        if not getattr(settings, "crafting", False) or not getattr(settings, "gunpowder_enabled", False):
+            logs.logger.info("[Gunpowder] Disabled in settings (crafting and/or gunpowder_enabled); skipping.")
+            return
+
+        meta = custom_stations.get_station_metadata(self.teleporter_name)
+        look_deg = abs(float(getattr(settings, "gunpowder_look_degrees", 25.0)))
+
+        def teleport():
+            logs.logger.info(f"[Gunpowder] Teleport -> Station: {self.teleporter_name}")
+            teleporter.teleport_not_default(meta)
+            time.sleep(0.5 * getattr(settings, "lag_offset", 1.0))
+
+        def open_megalab():
+            # Ensure pitch starts neutral before we do our look-up/down offsets
+            face_station(meta)
+            time.sleep(0.15 * settings.lag_offset)
+
+            # Look down to face the Megalab
+            utils.turn_down(look_deg)
+            time.sleep(0.25 * settings.lag_offset)
+            open_megalab_inventory("[Gunpowder]")
+
+        def transfer():
+            require_megalab()
+            # Typing the full item name keeps the first-slot assumption reliable.
+            megalab_crafting.transfer_filtered_to_player("gunpowder")
+
+        def craft():
+            require_megalab()
+            megalab_crafting.craft_from_crafting_tab("gunpowder", craft_seconds=getattr(settings, "gunpowder_craft_seconds", 2.0))
+
+        def deposit_step():
+            inventory.close()
+            time.sleep(0.25 * settings.lag_offset)
+
+            # Restore station-facing yaw + neutral pitch so the next task doesn't start misaligned
+            face_station(meta)
+
+            turn_deg_raw = getattr(settings, "gunpowder_turn_degrees", 180.0)
+            turn_deg = float(turn_deg_raw) if turn_deg_raw is not None else 0.0
+            if abs(turn_deg) > 0.1:
+                utils.turn_right(abs(turn_deg))
                 time.sleep(0.25 * settings.lag_offset)
 
-                # Restore station-facing yaw + neutral pitch so the next task doesn't start misaligned
-                utils.pitch_zero()
-                utils.set_yaw(meta.yaw)
-
-                turn_deg_raw = getattr(settings, "gunpowder_turn_degrees", 180.0)
-                turn_deg = float(turn_deg_raw) if turn_deg_raw is not None else 0.0
-                if abs(turn_deg) > 0.1:
-                    utils.turn_right(abs(turn_deg))
-                    time.sleep(0.25 * settings.lag_offset)
+            # Deposit to the station's dedicated storage boxes
+            deposit.dedi_deposit_custom_2(self.deposit_height)
+            time.sleep(0.25 * settings.lag_offset)
+            face_station(meta)
 
-                # Deposit to the station's dedicated storage boxes
-                deposit.dedi_deposit_custom_2(self.deposit_height)
-                time.sleep(0.25 * settings.lag_offset)
-
-                # Restore station-facing yaw + neutral pitch so the next task doesn't start misaligned
-                utils.pitch_zero()
-                utils.set_yaw(meta.yaw)
-                return
-
-            except Exception as e:
-                logs.logger.warning(f"[Gunpowder] Attempt {attempt}/{attempts_max} failed: {e}")
-
-                # Best-effort cleanup so the next attempt starts in a sane state.
-                try:
-                    inventory.close()
-                except Exception:
-                    pass
-                try:
-                    if meta is not None:
-                        utils.pitch_zero()
-                        utils.set_yaw(meta.yaw)
-                except Exception:
-                    pass
-
-                time.sleep(0.75 * getattr(settings, "lag_offset", 1.0))
-
-        logs.logger.error(f"[Gunpowder] Failed after {attempts_max} attempts; giving up until next schedule.")
+        steps = [
+            ("teleported", teleport, None),
+            ("opened_megalab", open_megalab, None),
+            ("transferred", transfer, open_megalab), # resuming here needs the megalab open again
+            ("crafted", craft, open_megalab),
+            ("deposited", deposit_step, None),
+        ]
+        self.run_steps("[Gunpowder]", meta, steps, int(getattr(config, "gunpowder_attempts", 3) or 3), close_inventory_cleanup)
 
 
     def get_priority_level(self):
@@ -373,59 +474,48 @@ class decay_prevention_station(base_task):
 
         self.one_shot = False
     def execute(self):
-        attempts_max = int(getattr(config, "decay_prevention_attempts", 3) or 3)
+        if not getattr(settings, "decay_prevention_enabled", False):
+            logs.logger.info("[DecayPrevention] Disabled in settings; skipping.")
+            return
 
-        for attempt in range(1, attempts_max + 1):
-            meta = None
-            try:
-                player_state.check_state()
-
-                if not getattr(settings, "decay_prevention_enabled", False):
-                    logs.logger.info("[DecayPrevention] Disabled in settings; skipping.")
-                    return
+        meta = custom_stations.get_station_metadata(self.teleporter_name)
 
-                meta = custom_stations.get_station_metadata(self.teleporter_name)
-                logs.logger.info(f"[DecayPrevention] Teleport -> Station: {self.teleporter_name}")
-                teleporter.teleport_not_default(meta)
+        def teleport():
+            logs.logger.info(f"[DecayPrevention] Teleport -> Station: {self.teleporter_name}")
+            teleporter.teleport_not_default(meta)
 
-                # Allow the world to render before we do anything else.
-                post_tp = float(getattr(settings, "decay_prevention_post_tp_delay", 15.0) or 0.0)
-                time.sleep(post_tp * getattr(settings, "lag_offset", 1.0))
+            # Allow the world to render before we do anything else.
+            post_tp = float(getattr(settings, "decay_prevention_post_tp_delay", 15.0) or 0.0)
+            time.sleep(post_tp * getattr(settings, "lag_offset", 1.0))
 
-                # Keep tribe log open long enough to fully render / stream the area.
-                tribelog.open()
-                if not tribelog.is_open():
-                    raise RuntimeError("Tribe log did not open (template not detected).")
+        def hold_tribelog():
+            # Keep tribe log open long enough to fully render / stream the area.
+            tribelog.open()
+            if not tribelog.is_open():
+                raise RuntimeError("Tribe log did not open (template not detected).")
 
-                time.sleep(float(getattr(settings, "decay_prevention_open_seconds", 20.0) or 20.0))
+            time.sleep(float(getattr(settings, "decay_prevention_open_seconds", 20.0) or 20.0))
 
-                tribelog.close()
-                if tribelog.is_open():
-                    raise RuntimeError("Tribe log did not close (still detected).")
+            tribelog.close()
+            if tribelog.is_open():
+                raise RuntimeError("Tribe log did not close (still detected).")
 
-                # Restore station-facing yaw + neutral pitch so the next task doesn't start misaligned
-                utils.pitch_zero()
-                utils.set_yaw(meta.yaw)
-                return
-
-            except Exception as e:
-                logs.logger.warning(f"[DecayPrevention] Attempt {attempt}/{attempts_max} failed: {e}")
+        def restore():
+            # Restore station-facing yaw + neutral pitch so the next task doesn't start misaligned
+            face_station(meta)
 
-                # Best-effort cleanup so the next attempt starts in a sane state.
-                try:
-                    tribelog.close()
-                except Exception:
-                    pass
-                try:
-                    if meta is not None:
-                        utils.pitch_zero()
-                        utils.set_yaw(meta.yaw)
-                except Exception:
-                    pass
-
-                time.sleep(1.0 * getattr(settings, "lag_offset", 1.0))
+        def cleanup():
+            try:
+                tribelog.close()
+            except Exception:
+                pass
 
-        logs.logger.error(f"[DecayPrevention] Failed after {attempts_max} attempts; giving up until next schedule.")
+        steps = [
+            ("teleported", teleport, None),
+            ("rendered", hold_tribelog, None),
+            ("restored", restore, None),
+        ]
+        self.run_steps("[DecayPrevention]", meta, steps, int(getattr(config, "decay_prevention_attempts", 3) or 3), cleanup, retry_sleep=1.0)
 
 
     def get_priority_level(self):
@@ -465,12 +555,15 @@ class render_station(base_task):
         return 90 # after triggered we will wait for 60 seconds reduces the amount of cpu usage 
     
 class snail_pheonix(base_task):
+    pickup_weight = config.snail_pickup_weight
+
     def __init__(self,name,teleporter_name,direction,depo):
         super().__init__()
         self.name = name
         self.teleporter_name = teleporter_name
         self.direction = direction
         self.depo_tp = depo
+        self.batch_kind = deposit_batch.depo_kind(depo) # collects sharing a depo can share the trip
 
     def execute(self):
         gacha_metadata = custom_stations.get_station_metadata(self.teleporter_name)
@@ -481,10 +574,9 @@ class snail_pheonix(base_task):
         time.sleep(0.2)
         gacha.collection(gacha_metadata)
         time.sleep(0.2)
-        teleporter.teleport_not_default(self.depo_tp)
-        time.sleep(0.2)
-        deposit.dedi_deposit(settings.height_ele)
-        time.sleep(0.2)
+        deposit_batch.add(self.batch_kind, self.pickup_weight, lambda: depo_trip(self.depo_tp))
+        if not deposit_batch.should_defer(self.batch_kind, self.next_due()):
+            deposit_batch.flush(self.batch_kind)
         
     def get_priority_level(self):
         # Shifted to remain after normal gachas.
@@ -493,6 +585,8 @@ class snail_pheonix(base_task):
         return 13200
 
 class pause(base_task):
+    keeps_inventory = True # only sits in the tekpod so it can cut into a task carrying berries / seeds
+
     def __init__(self,time):
         super().__init__()
         self.name = "pause"
@@ -0,0 +1,130 @@
+"""Background watcher for crashes, a closed game and disconnects.
+
+Without it a crash in the middle of a long station only shows up once dozens of actions have timed
+out. The watcher polls every settings.health_poll_seconds (crash window titles, whether the game
+window still exists, the disconnect indicator) and publishes the result. Long waits and key presses
+call `raise_if_unhealthy()` so the running task aborts with GameUnhealthyError and the scheduler can
+go straight to recovery.
+
+Recovery itself runs inside `recovering()` so its own waits and key presses don't abort it.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import settings
+import windows
+import screen_monitor
+import logs.gachalogs as logs
+from reconnect import crash, recon_utils
+
+HEALTHY = "healthy"
+CRASHED = "crashed"
+NOT_RUNNING = "not_running"
+DISCONNECTED = "disconnected"
+
+
+class GameUnhealthyError(RuntimeError):
+    def __init__(self, state: str, since: float):
+        super().__init__(f"game is {state} (for {time.time() - since:.1f}s)")
+        self.state = state
+        self.since = since
+
+
+_lock = threading.Lock()
+_status = {"state": HEALTHY, "since": time.time(), "checked": 0.0}
+_suspended = 0
+_thread = None
+_stop = threading.Event()
+stats = {"polls": 0, "poll_seconds": 0.0, "aborts": 0}
+
+
+def _disconnected() -> bool:
+    monitored = screen_monitor.lookup("disconnected")
+    if monitored is not None:
+        return monitored
+    return recon_utils.check_template_no_bounds("escape",0.7)
+
+
+def poll() -> str:
+    game = crash.crash(windows.hwnd)
+    if game.detect_crash():
+        return CRASHED
+    if not game.is_running():
+        return NOT_RUNNING
+    if _disconnected():
+        return DISCONNECTED
+    return HEALTHY
+
+
+def _publish(state: str):
+    with _lock:
+        if state != _status["state"]:
+            if state != HEALTHY:
+                logs.logger.critical(f"health watcher: game is {state}")
+            _status["state"] = state
+            _status["since"] = time.time()
+        _status["checked"] = time.time()
+
+
+def _run():
+    unhealthy_polls = 0
+    while not _stop.is_set():
+        start = time.time()
+        try:
+            state = poll()
+            # a single disconnect match can be a template false positive, crashes and a missing window are not
+            unhealthy_polls = unhealthy_polls + 1 if state == DISCONNECTED else 0
+            if state != DISCONNECTED or unhealthy_polls >= settings.health_confirm_polls:
+                _publish(state)
+        except Exception as e:
+            logs.logger.debug(f"health watcher poll failed: {e}")
+        stats["polls"] += 1
+        stats["poll_seconds"] += time.time() - start
+        _stop.wait(settings.health_poll_seconds)
+
+
+def start():
+    global _thread
+    if not settings.health_watcher_enabled or (_thread is not None and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="health_watcher", daemon=True)
+    _thread.start()
+    logs.logger.info(f"health watcher started polling every {settings.health_poll_seconds}s")
+
+
+def stop():
+    _stop.set()
+
+
+def status() -> dict:
+    with _lock:
+        return dict(_status)
+
+
+def is_healthy() -> bool:
+    return status()["state"] == HEALTHY
+
+
+def raise_if_unhealthy():
+    """aborts whatever the task is doing when the watcher has seen the game go down"""
+    if _suspended:
+        return
+    current = status()
+    if current["state"] != HEALTHY:
+        stats["aborts"] += 1
+        raise GameUnhealthyError(current["state"], current["since"])
+
+
+@contextmanager
+def recovering():
+    """recovery drives the game while it is unhealthy so nothing inside should abort, state is cleared once done"""
+    global _suspended
+    _suspended += 1
+    try:
+        yield
+    finally:
+        _suspended -= 1
+        if _suspended == 0:
+            _publish(HEALTHY)
@@ -0,0 +1,75 @@
+"""Online per-action latency samples.
+
+Every fixed wait in the bot is `base * settings.lag_offset`, which pads every action for the worst
+case. This module keeps a rolling window per action type of how long UI transitions actually take:
+template.template_await_true / template_await_false record the time from the input until the
+detector flips when they are given an action (timeouts are left out so they don't skew the
+percentiles) and await_settled records how long a grid took to settle. report() logs the
+percentiles after every task so lag_offset and the fixed waits can be tuned from real numbers.
+"""
+import math
+import threading
+from collections import deque
+
+import logs.gachalogs as logs
+
+WINDOW = 200
+
+_lock = threading.Lock()
+_samples = {}  # action -> deque[float]
+
+
+def record(action: str, seconds: float):
+    with _lock:
+        window = _samples.get(action)
+        if window is None:
+            window = _samples[action] = deque(maxlen=WINDOW)
+        window.append(float(seconds))
+
+
+def samples(action: str) -> list:
+    with _lock:
+        return list(_samples.get(action, ()))
+
+
+def percentile(action: str, pct: float):
+    data = sorted(samples(action))
+    if not data:
+        return None
+    # nearest-rank, good enough for a window of a few hundred samples
+    rank = max(0, min(len(data) - 1, math.ceil(pct / 100.0 * len(data)) - 1))
+    return data[rank]
+
+
+def histogram(action: str, edges=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0)) -> list:
+    """counts of samples per bucket, the last bucket holds everything above the last edge"""
+    counts = [0] * (len(edges) + 1)
+    for value in samples(action):
+        for index, edge in enumerate(edges):
+            if value <= edge:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+
+def format_histogram(action: str, edges=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0)) -> str:
+    labels = [f"<={edge}s" for edge in edges] + [f">{edges[-1]}s"]
+    return " ".join(f"{label}:{count}" for label, count in zip(labels, histogram(action, edges)))
+
+
+def report():
+    """Log percentiles per action."""
+    with _lock:
+        actions = {name: list(window) for name, window in _samples.items()}
+
+    for name in sorted(actions):
+        data = sorted(actions[name])
+        if not data:
+            continue
+        logs.logger.debug(
+            f"latency {name}: n={len(data)} p50={percentile(name, 50):.3f}s p90={percentile(name, 90):.3f}s max={data[-1]:.3f}s"
+        )
+        if name.startswith("teleport_"):
+            logs.logger.debug(f"latency {name} histogram {format_histogram(name)}")
@@ -0,0 +1,69 @@
+"""Memo for screen predicates keyed by the input epoch.
+
+The same question often gets asked several times with no input in between (a close loop checking
+is_open and then awaiting it, reset_state closing panels that were just closed). windows.input_epoch
+is bumped by every click, mouse move, turn and key press, so a predicate result from the same epoch
+that is younger than ASA.config.memo_staleness seconds is returned instead of capturing again.
+
+Awaits are waiting for the screen to change on its own, they run inside `fresh()` so every poll is a
+real evaluation (the result is still stored for whoever asks next).
+"""
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import ASA.config
+import windows
+import logs.gachalogs as logs
+
+_lock = threading.Lock()
+_cache = {}  # (detector, args) -> (epoch, time, value)
+_local = threading.local()
+stats = {}  # detector -> {"hits", "misses"}
+
+
+@contextmanager
+def fresh():
+    _local.depth = getattr(_local, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+
+
+def _count(name: str, hit: bool):
+    entry = stats.setdefault(name, {"hits": 0, "misses": 0})
+    entry["hits" if hit else "misses"] += 1
+
+
+def memoized(func):
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args):
+        key = (name, args)
+        now = time.time()
+        if ASA.config.memo_enabled and getattr(_local, "depth", 0) == 0:
+            with _lock:
+                entry = _cache.get(key)
+                if entry is not None and entry[0] == windows.input_epoch and now - entry[1] <= ASA.config.memo_staleness:
+                    _count(name, True)
+                    return entry[2]
+        epoch = windows.input_epoch # read before evaluating so an input landing mid capture isnt credited to this value
+        value = func(*args)
+        with _lock:
+            _cache[key] = (epoch, time.time(), value)
+            _count(name, False)
+        return value
+    return wrapper
+
+
+def report():
+    with _lock:
+        snapshot = {name: dict(entry) for name, entry in stats.items()}
+    for name, entry in sorted(snapshot.items()):
+        total = entry["hits"] + entry["misses"]
+        if total:
+            logs.logger.debug(f"predicate memo {name}: {entry['hits']}/{total} hits ({entry['hits'] / total * 100:.0f}%)")
+    return snapshot
@@ -49,20 +49,33 @@ class crash():
         else:
             logs.logger.critical("steam exe not found at the expected location cannot relaunch game")
             
+    def is_running(self):
+        return windows.find_window_by_title("ArkAscended") != 0
+
+    def wait_for_exit(self, timeout:float = 10):
+        """waits for the game window to go away instead of a fixed sleep before relaunching"""
+        start = time.time()
+        while self.is_running() and time.time() - start < timeout:
+            time.sleep(0.25)
+
+    def wait_for_window(self, timeout:float = 60):
+        start = time.time()
+        while not self.is_running() and time.time() - start < timeout:
+            time.sleep(0.5)
+        windows.hwnd = windows.find_window_by_title("ArkAscended") # new process ID as game as relaunced
+        return self.is_running()
+
     def re_open_game(self):
         self.close_game()
-        time.sleep(10)
+        self.wait_for_exit()
         self.launch_game_with_steam()
-        recon_utils.template_sleep_no_bounds("join_last_session",0.7,60)
-        windows.hwnd = windows.find_window_by_title("ArkAscended") # new process ID as game as relaunced
+        if self.wait_for_window():
+            recon_utils.template_sleep_no_bounds("join_last_session",0.7,60)
+        windows.hwnd = windows.find_window_by_title("ArkAscended")
         
     def crash_rejoin(self):
         if self.detect_crash():
-            self.close_game()
-            time.sleep(10)
-            self.launch_game_with_steam()
-            recon_utils.template_sleep_no_bounds("join_last_session",0.7,60)
-            windows.hwnd = windows.find_window_by_title("ArkAscended") # new process ID as game as relaunced
+            self.re_open_game()
 
 
 
@@ -0,0 +1,104 @@
+"""Whole screen classifier for the menu / reconnect screens.
+
+The client frame is shrunk to a SIZE greyscale thumbnail and compared against a library of labelled
+thumbnails captured from each menu state (json_files/menu_fingerprints.json). The nearest one wins
+if it is within MAX_DISTANCE, otherwise the screen is unknown and callers fall back to the template
+checks in recon_utils. Classifying is a resize and a handful of vector subtractions so it takes
+about a millisecond once the frame has been grabbed.
+
+Capturing a state (with the game sat on that screen):
+    python -m reconnect.fingerprint main_menu
+"""
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+import screen
+import logs.gachalogs as logs
+
+LIBRARY_PATH = "json_files/menu_fingerprints.json"
+SIZE = (32, 18) # 16:9 so every client resolution shrinks to the same shape
+MAX_DISTANCE = 0.06 # mean absolute grey difference (0-1) still counted as the same screen
+
+# states the reconnect flow knows how to handle
+MAIN_MENU = "main_menu"
+JOIN_MENU = "join_menu"
+SERVER_LIST = "server_list"
+JOINING = "joining"
+MOD_PROMPT = "mod_prompt"
+LOADING = "loading"
+SERVER_FULL = "server_full"
+JOIN_FAILED = "join_failed"
+CONNECTION_TIMEOUT = "connection_timeout"
+SEARCHING = "searching"
+NO_SESSION = "no_session"
+IN_GAME = "in_game"
+
+_library = None
+
+
+def fingerprint(frame) -> np.ndarray:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, SIZE, interpolation=cv2.INTER_AREA)
+    return small.astype(np.float32).ravel() / 255.0
+
+
+def load_library():
+    global _library
+    try:
+        with open(LIBRARY_PATH, "r") as file:
+            data = json.load(file)
+    except (json.JSONDecodeError, FileNotFoundError):
+        data = []
+    labels = [entry["label"] for entry in data]
+    matrix = np.array([entry["fingerprint"] for entry in data], dtype=np.float32).reshape(len(data), SIZE[0] * SIZE[1])
+    _library = (labels, matrix)
+    return _library
+
+
+def _get_library():
+    return _library if _library is not None else load_library()
+
+
+def classify(frame=None):
+    """returns (label, distance) for the nearest library entry, label is None when nothing is close enough"""
+    labels, matrix = _get_library()
+    if not labels:
+        return None, None
+    if frame is None:
+        frame = screen.grab_client()
+    start = time.perf_counter()
+    distances = np.abs(matrix - fingerprint(frame)).mean(axis=1)
+    best = int(np.argmin(distances))
+    distance = float(distances[best])
+    label = labels[best] if distance <= MAX_DISTANCE else None
+    logs.logger.template(f"fingerprint {label} nearest:{labels[best]} distance:{distance:.4f} in {(time.perf_counter() - start) * 1000:.2f}ms")
+    return label, distance
+
+
+def capture(label: str, frame=None):
+    """adds the current screen to the library under label"""
+    if frame is None:
+        frame = screen.grab_client()
+    try:
+        with open(LIBRARY_PATH, "r") as file:
+            data = json.load(file)
+    except (json.JSONDecodeError, FileNotFoundError):
+        data = []
+    data.append({"label": label, "fingerprint": [round(float(v), 4) for v in fingerprint(frame)]})
+    os.makedirs(os.path.dirname(LIBRARY_PATH), exist_ok=True)
+    with open(LIBRARY_PATH, "w") as file:
+        json.dump(data, file)
+    load_library()
+    logs.logger.info(f"captured fingerprint for {label} ({sum(1 for entry in data if entry['label'] == label)} samples)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python -m reconnect.fingerprint <label>")
+        sys.exit(1)
+    capture(sys.argv[1])
@@ -1,32 +1,173 @@
-from reconnect import join_menu , main_menu , multiplayer_menu , recon_utils , crash 
+from reconnect import join_menu , main_menu , multiplayer_menu , recon_utils , crash , fingerprint
 import time 
 import template
+import ASA.player.tribelog
 import windows
+import screen_monitor
+import screen
+import utils
+import cv2
+import numpy as np
+import logs.gachalogs as logs
+from collections import deque
+
+# seconds to wait for the screen to move on after acting on a state, retries back off from here
+STATE_TIMEOUTS = {
+    fingerprint.MAIN_MENU: 10,
+    fingerprint.CONNECTION_TIMEOUT: 5,
+    fingerprint.JOIN_MENU: 10,
+    fingerprint.SERVER_LIST: 15,
+    fingerprint.JOINING: 30,
+    fingerprint.MOD_PROMPT: 15,
+    fingerprint.LOADING: 120,
+    fingerprint.SERVER_FULL: 5,
+    fingerprint.JOIN_FAILED: 5,
+    fingerprint.SEARCHING: 15,
+    fingerprint.NO_SESSION: 5,
+    None: 10, # screen we cant identify (mostly the world rendering in before the tribelog shows)
+}
+MAX_STATE_ATTEMPTS = 5 # times a state is retried before the game gets relaunched
+RETRY_BACKOFF = 2 # seconds before the first retry, doubles every retry
+RETRY_BACKOFF_CAP = 60
+POLL = 0.25
+
+RENDER_MIN_WAIT = 5 # after joining wait at least this long then until the view stops changing
+RENDER_MAX_WAIT = 60 # the old fixed wait
+RENDER_STABLE_SECONDS = 3
+RENDER_THRESHOLD = 2.0 # mean grey level change between checks still counted as rendered in
+
+incidents = deque(maxlen=50) # {"start", "seconds", "relaunches", "states"} per reconnect
+
+def detect_state():
+    """whole screen label from the fingerprint library, falling back to the template checks when the screen isnt in it"""
+    label, _ = fingerprint.classify()
+    if label is not None:
+        return label
+    if template.check_template_no_bounds("tribelog_check",0.8) or template.check_template("death_regions",0.7):
+        return fingerprint.IN_GAME
+    if recon_utils.check_template_no_bounds("connection_timeout",0.7):
+        return fingerprint.CONNECTION_TIMEOUT
+    if recon_utils.check_template("server_full",0.7):
+        return fingerprint.SERVER_FULL
+    if recon_utils.check_template("red_fail",0.7):
+        return fingerprint.JOIN_FAILED
+    if recon_utils.check_template_no_bounds("mod_join",0.7):
+        return fingerprint.MOD_PROMPT
+    if recon_utils.check_template("join_text",0.7):
+        return fingerprint.JOINING
+    if recon_utils.check_template_no_bounds("loading_screen",0.7):
+        return fingerprint.LOADING
+    if recon_utils.check_template_no_bounds("searching",0.7):
+        return fingerprint.SEARCHING
+    if recon_utils.check_template_no_bounds("no_session",0.7):
+        return fingerprint.NO_SESSION
+    if main_menu.is_open():
+        return fingerprint.MAIN_MENU
+    if join_menu.is_open():
+        return fingerprint.JOIN_MENU
+    if multiplayer_menu.is_open():
+        return fingerprint.SERVER_LIST
+    return None
+
+def await_state_change(state, timeout:float):
+    """polls the screen until it shows something other than state, returns the new state (or state on timeout)"""
+    start = time.time()
+    while time.time() - start < timeout:
+        time.sleep(POLL)
+        current = detect_state()
+        if current != state:
+            return current
+    return state
+
+def await_rendered():
+    """waits until the view stops changing (structures popping in) instead of a fixed minute"""
+    start = time.time()
+    time.sleep(RENDER_MIN_WAIT)
+    previous = None
+    stable_since = None
+    while time.time() - start < RENDER_MAX_WAIT:
+        gray = cv2.cvtColor(screen.grab_client(), cv2.COLOR_BGRA2GRAY)
+        small = cv2.resize(gray, (64, 36), interpolation=cv2.INTER_AREA).astype(np.int16)
+        if previous is not None and float(np.mean(np.abs(small - previous))) <= RENDER_THRESHOLD:
+            stable_since = stable_since or time.time()
+            if time.time() - stable_since >= RENDER_STABLE_SECONDS:
+                break
+        else:
+            stable_since = None
+        previous = small
+        time.sleep(0.5)
+    logs.logger.debug(f"world rendered in after {time.time() - start:.1f}s")
+
 class reconnect():
 
     def __init__(self,server):
         self.server = server
-        pass
+        self.handlers = {
+            fingerprint.MAIN_MENU: main_menu.enter_menu,
+            fingerprint.CONNECTION_TIMEOUT: main_menu.enter_menu, # clicks accept on the timeout popup first
+            fingerprint.JOIN_MENU: join_menu.enter_menu,
+            fingerprint.SERVER_LIST: lambda: multiplayer_menu.search_and_join(self.server),
+            fingerprint.MOD_PROMPT: multiplayer_menu.accept_mods,
+            fingerprint.SERVER_FULL: multiplayer_menu.dismiss_server_full,
+            fingerprint.JOIN_FAILED: multiplayer_menu.dismiss_join_failed,
+            fingerprint.NO_SESSION: multiplayer_menu.back_out,
+            None: lambda: utils.press_key("ShowTribeManager"), # the tribelog only opens once we are in the world
+        }
 
     def check_disconected(self):
+        monitored = screen_monitor.lookup("disconnected")
+        if monitored is not None:
+            return monitored
         return recon_utils.check_template_no_bounds("escape",0.7)
+
+    def relaunch(self, incident, reason:str):
+        logs.logger.critical(f"relaunching the game: {reason}")
+        crash.crash(windows.hwnd).re_open_game()
+        incident["relaunches"] += 1
              
     def rejoin_server(self):
-        joined = False
-
-        start_time = time.time()
+        """
+        walks the menus back into the server driven by whatever screen is showing
+        every state gets STATE_TIMEOUTS to move on after we act on it, retries back off and the game is only relaunched
+        once a state has been retried MAX_STATE_ATTEMPTS times or the game isnt running at all
+        """
+        incident = {"start": time.time(), "seconds": 0.0, "relaunches": 0, "states": []}
         c = crash.crash(windows.hwnd)
-        c.re_open_game()
-
-        while not joined:
-            if (time.time() - start_time) >= 5*60:
-                c = crash.crash(windows.hwnd)
-                c.re_open_game()
-                start_time = time.time()
-                print("time was greater than x crashing game now")
-            main_menu.enter_menu()
-            join_menu.enter_menu()
-            multiplayer_menu.join_server(self.server)
-            if template.check_template_no_bounds("tribelog_check",0.8) or template.check_template("death_regions",0.7):
-                joined = True
-                return 
+        if c.detect_crash() or not c.is_running():
+            self.relaunch(incident, "game crashed or isnt running")
+
+        state = detect_state()
+        entered = time.time()
+        attempts = 0
+        while state != fingerprint.IN_GAME:
+            handler = self.handlers.get(state)
+            if handler is not None:
+                handler()
+            new_state = await_state_change(state, STATE_TIMEOUTS.get(state, STATE_TIMEOUTS[None]))
+            if new_state != state:
+                logs.logger.debug(f"reconnect {state} -> {new_state} after {time.time() - entered:.1f}s")
+                incident["states"].append((state, time.time() - entered))
+                state, entered, attempts = new_state, time.time(), 0
+                continue
+
+            attempts += 1
+            if attempts >= MAX_STATE_ATTEMPTS:
+                self.relaunch(incident, f"stuck on {state} after {attempts} attempts")
+                state, entered, attempts = detect_state(), time.time(), 0
+                continue
+            backoff = min(RETRY_BACKOFF * 2 ** (attempts - 1), RETRY_BACKOFF_CAP)
+            logs.logger.warning(f"reconnect still on {state} retrying in {backoff}s ({attempts}/{MAX_STATE_ATTEMPTS})")
+            time.sleep(backoff)
+            state = detect_state()
+
+        incident["states"].append((state, time.time() - entered))
+        ASA.player.tribelog.close()
+        await_rendered()
+        incident["seconds"] = time.time() - incident["start"]
+        incidents.append(incident)
+        average = sum(entry["seconds"] for entry in incidents) / len(incidents)
+        logs.logger.critical(
+            f"reconnected in {incident['seconds']:.1f}s with {incident['relaunches']} relaunches | "
+            f"average {average:.1f}s over {len(incidents)} reconnects"
+        )
+        return incident
@@ -173,6 +173,23 @@ def get_screen_roi(start_x: int, start_y: int, width: int, height: int, base_coo
         return np.array(screenshot)
 
 
+def grab_client():
+    """Capture the whole client area in one grab (BGRA numpy array) for checking several ROIs against one frame."""
+    region = {"top": client_top, "left": client_left, "width": screen_width, "height": screen_height}
+    with mss.mss() as sct:
+        return np.array(sct.grab(region))
+
+
+def crop(frame, start_x: int, start_y: int, width: int, height: int, base_coords: bool = True):
+    """Same region get_screen_roi would capture, cut out of a frame from grab_client()."""
+    if base_coords:
+        cx, cy = map_x(start_x), map_y(start_y)
+        cw, ch = max(1, map_w(width)), max(1, map_h(height))
+    else:
+        cx, cy, cw, ch = int(start_x), int(start_y), int(width), int(height)
+    return frame[cy:cy + ch, cx:cx + cw]
+
+
 def client_to_desktop(x: int, y: int):
     """Convert client-area coords to desktop coords (for pyautogui)."""
     return (client_left + int(x), client_top + int(y))
@@ -0,0 +1,119 @@
+"""Optional background thread that keeps a classification of what is on screen.
+
+Every `is_open()` style question used to pay for its own capture and template match on the critical
+path. With settings.screen_monitor_enabled the monitor grabs the whole client area at
+settings.screen_monitor_fps, runs every classifier against that one frame and keeps the result with
+a timestamp. `lookup(state)` answers from that snapshot while it is younger than
+settings.screen_monitor_max_age and returns None otherwise so callers do their own live check.
+
+settings.screen_monitor_cpu_budget caps the share of one core the thread may use: when classifying a
+frame takes longer than the budget allows, the thread sleeps longer before the next one.
+"""
+import threading
+import time
+
+import numpy as np
+import cv2
+
+import settings
+import screen
+import windows
+import template
+import reconnect.recon_utils
+import logs.gachalogs as logs
+
+_lock = threading.Lock()
+_snapshot = {"time": 0.0, "states": {}}
+_thread = None
+_stop = threading.Event()
+stats = {"frames": 0, "hits": 0, "misses": 0, "busy_seconds": 0.0}
+
+BOUNDED = ((0,30,200),(255,255,255))
+NO_BOUNDS = ((0,0,0),(255,255,255))
+
+
+def _console_open(frame) -> bool:
+    for start_y in (1419, 1065): # bottom strip (single line) and middle strip (expanded)
+        gray = cv2.cvtColor(screen.crop(frame, 0, start_y, 2560, 2), cv2.COLOR_BGR2GRAY)
+        in_bounds = (gray >= template.lower_console_bound) & (gray <= template.upper_console_bound)
+        if np.count_nonzero(in_bounds) / gray.size >= 0.8:
+            return True
+    return False
+
+
+def _classifiers():
+    recon = reconnect.recon_utils.location
+    return {
+        "inventory": lambda frame: template.check_frame(frame, template.roi_regions["inventory"], "inventory", 0.7, *BOUNDED),
+        "teleporter": lambda frame: template.check_frame(frame, template.roi_regions["teleporter_title"], "teleporter_title", 0.7, *BOUNDED),
+        "bed": lambda frame: template.check_frame(frame, template.roi_regions["beds_title"], "beds_title", 0.7, *BOUNDED),
+        "death": lambda frame: template.check_frame(frame, template.roi_regions["death_regions"], "death_regions", 0.7, *BOUNDED),
+        "tribelog": lambda frame: template.check_frame(frame, template.roi_regions["tribelog_check"], "tribelog_check", 0.8, *NO_BOUNDS),
+        "disconnected": lambda frame: template.check_frame(frame, recon["escape"], "escape", 0.7, *NO_BOUNDS),
+        "loading": lambda frame: template.check_frame(frame, recon["loading_screen"], "loading_screen", 0.7, *NO_BOUNDS),
+        "console": _console_open,
+    }
+
+
+def classify(frame) -> dict:
+    states = {}
+    for name, classifier in _classifiers().items():
+        try:
+            states[name] = bool(classifier(frame))
+        except Exception as e: # a missing icon shouldnt take the other states down with it
+            logs.logger.debug(f"screen monitor could not classify {name}: {e}")
+    return states
+
+
+def _run():
+    interval = 1.0 / max(0.1, float(settings.screen_monitor_fps))
+    budget = min(1.0, max(0.05, float(settings.screen_monitor_cpu_budget)))
+    while not _stop.is_set():
+        start = time.time()
+        try:
+            frame = screen.grab_client()
+            captured = time.time()
+            states = classify(frame)
+            with _lock:
+                _snapshot["time"] = captured
+                _snapshot["states"] = states
+                stats["frames"] += 1
+        except Exception as e:
+            logs.logger.debug(f"screen monitor frame failed: {e}")
+        busy = time.time() - start
+        stats["busy_seconds"] += busy
+        # busy / (busy + idle) <= budget
+        _stop.wait(max(interval - busy, busy * (1.0 / budget - 1.0)))
+
+
+def start():
+    global _thread
+    if not settings.screen_monitor_enabled or (_thread is not None and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="screen_monitor", daemon=True)
+    _thread.start()
+    logs.logger.info(f"screen monitor started at {settings.screen_monitor_fps} fps cpu budget {settings.screen_monitor_cpu_budget}")
+
+
+def stop():
+    _stop.set()
+
+
+def lookup(state: str):
+    """the monitored value for state if the snapshot is fresh enough, otherwise None"""
+    if _thread is None or not _thread.is_alive():
+        return None
+    with _lock:
+        captured = _snapshot["time"]
+        value = _snapshot["states"].get(state)
+    # a frame captured before our last input cant know what that input did
+    if value is None or time.time() - captured > settings.screen_monitor_max_age or captured < windows.last_input_time:
+        stats["misses"] += 1
+        return None
+    stats["hits"] += 1
+    return value
+
+
+def summary() -> str:
+    return f"{stats['frames']} frames {stats['hits']} hits {stats['misses']} misses {stats['busy_seconds']:.1f}s busy"
@@ -4,6 +4,16 @@ enable_resolution_mapping: bool = True # Controls how 2560x1440-authored coordin
 # (True) keeps the existing multi-resolution behavior.
 
 lag_offset: float = 1.4
+screen_monitor_enabled: bool = False # Background thread that keeps classifying the screen so is_open() style checks can be answered without a capture.
+screen_monitor_fps: float = 10 # Frames per second the monitor tries to classify.
+screen_monitor_max_age: float = 0.15 # Seconds a monitor snapshot is trusted for; older snapshots fall back to a live check.
+screen_monitor_cpu_budget: float = 0.25 # Max share of one CPU core the monitor may use (it slows down instead of going over).
+scheduler_mode: str = "priority" # "priority" runs due tasks by priority level, "edf" runs the one with the earliest deadline (pego deadlines come from their fill rate).
+preemption_enabled: bool = True # Let due higher priority tasks (pego, pause, watchdog render) cut into a running gacha at its checkpoints.
+health_watcher_enabled: bool = True # Background thread that notices crashes / disconnects mid task and aborts the task straight into recovery.
+health_poll_seconds: float = 2.0 # Seconds between health polls.
+health_confirm_polls: int = 2 # Disconnect has to be seen this many polls in a row (crashes and a closed game count straight away).
+hud_vitals_enabled: bool = False # Read food / water / tekpod off the HUD for the per task check; the buff panel is only opened when the HUD cant be read. Not usable yet: the hud_food / hud_water regions are uncalibrated placeholders, leave off until they are measured from real captures.
 ui_layout_mode: str = "centered_16_9"  # "centered_16_9" (default, recommended for ultrawide) or "stretch"
 use_hdr_templates: bool = False # If True and an icons*_hdr folder exists (e.g., icons1440_hdr, icons2160_hdr), templates will load from it.
 iguanadon: str = "GACHAIGUANADON"
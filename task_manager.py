@@ -4,9 +4,19 @@ import re
 import time
 from pathlib import Path
 from threading import Lock
+from collections import deque
 
 import settings
 import bot.stations as stations
+import latency
+import screen_monitor
+import predicate_memo
+import health_watcher
+import bot.station_health as station_health
+import bot.aim_corrections as aim_corrections
+import bot.deposit_batch as deposit_batch
+import bot.seed_planner as seed_planner
+import ASA.player.player_state
 import logs.gachalogs as logs
 
 
@@ -57,6 +67,16 @@ class priority_queue_exc:
                 return self.queue[0]
         return None
 
+    def take_first(self, match):
+        """Remove and return the soonest entry whose task match() accepts."""
+        with self._lock:
+            for entry in sorted(self.queue):
+                if match(entry[3]):
+                    self.queue.remove(entry)
+                    heapq.heapify(self.queue)
+                    return entry
+        return None
+
     def is_empty(self):
         with self._lock:
             return len(self.queue) == 0
@@ -100,6 +120,23 @@ class priority_queue_prio:
                 return self.queue[0]
         return None
 
+    def peek_by(self, key):
+        """Entry with the smallest key(entry) without removing it (EDF ordering over the same tuples)."""
+        with self._lock:
+            if self.queue:
+                return min(self.queue, key=key)
+        return None
+
+    def pop_by(self, key):
+        """Remove and return the entry with the smallest key(entry)."""
+        with self._lock:
+            if not self.queue:
+                return None
+            entry = min(self.queue, key=key)
+            self.queue.remove(entry)
+            heapq.heapify(self.queue)
+            return entry
+
     def is_empty(self):
         with self._lock:
             return len(self.queue) == 0
@@ -149,6 +186,15 @@ class task_scheduler(metaclass=SingletonMeta):
             self.initialized = True
             self.prev_task_name = ""
 
+            # preemption / lateness tracking (seconds between a task being due and it starting)
+            self.lateness = {}
+            self.preemption_latency = deque(maxlen=200)
+
+            # deadline tracking (seconds a task started after its deadline, negative = early) and service time per task
+            self.deadline_lateness = {}
+            self.service_time = {}
+            self._last_overload_warning = 0.0
+
             # watchdog / cycle tracking
             self.last_render_exec = time.time()
             self._maintenance_timeout_sec = 3 * 60 * 60  # force render at least once every 3 hours
@@ -246,8 +292,101 @@ class task_scheduler(metaclass=SingletonMeta):
             else:
                 break
 
+    def preempt_check(self, task, checkpoint, holding_items):
+        """called from task checkpoints, True when due work with a higher priority should run first"""
+        health_watcher.raise_if_unhealthy()
+        if not getattr(settings, "preemption_enabled", True):
+            return False
+        self.move_ready_tasks_to_active_queue(time.time())
+        top = self.active_queue.peek()
+        if not top:
+            return False
+        priority, exec_time, _, waiting = top
+        if priority >= task.get_priority_level():
+            return False
+        if holding_items and not getattr(waiting, "keeps_inventory", False):
+            return False # it would drop / deposit what this task is carrying
+        latency_seconds = time.time() - exec_time
+        self.preemption_latency.append(latency_seconds)
+        logs.logger.info(
+            f"preempting {getattr(task, 'name', '<unnamed>')} at {checkpoint} for {getattr(waiting, 'name', '<unnamed>')} "
+            f"which has been due for {latency_seconds:.1f}s"
+        )
+        return True
+
+    def deadline_of(self, task, exec_time):
+        get_deadline = getattr(task, "get_deadline", None)
+        return get_deadline(exec_time) if get_deadline is not None else exec_time
+
+    def _edf_key(self, entry):
+        priority, exec_time, _, task = entry
+        # priority 1 (pause, render, watchdog) keeps going first, everything else by deadline
+        return (0 if priority <= 1 else 1, self.deadline_of(task, exec_time), priority)
+
+    def _edf(self):
+        return getattr(settings, "scheduler_mode", "priority") == "edf"
+
+    def next_due(self):
+        """(task, seconds until due) of the task that would run next, None if nothing is queued"""
+        self.move_ready_tasks_to_active_queue(time.time())
+        top = self.active_queue.peek_by(self._edf_key) if self._edf() else self.active_queue.peek()
+        if top:
+            return top[3], 0.0
+        top = self.waiting_queue.peek()
+        if top:
+            return top[3], max(0.0, top[0] - time.time())
+        return None
+
+    def pull_forward(self, match):
+        """moves the soonest waiting task match() accepts onto the active queue so it runs next at its priority"""
+        entry = self.waiting_queue.take_first(match)
+        if entry is None:
+            return None
+        exec_time, _, priority, task = entry
+        logs.logger.info(f"pulling {getattr(task, 'name', '<unnamed>')} forward by {max(0.0, exec_time - time.time()):.0f}s")
+        self.active_queue.add(task, priority, time.time())
+        return task
+
+    def _record_lateness(self, task, exec_time, now):
+        kind = type(task).__name__
+        window = self.lateness.setdefault(kind, deque(maxlen=200))
+        window.append(max(0.0, now - exec_time))
+        if isinstance(task, stations.pego_station):
+            data = sorted(window)
+            message = f"pego lateness {data[len(data) // 2]:.1f}s median {data[-1]:.1f}s max over {len(data)} runs"
+            if self.preemption_latency:
+                message += f" | preemption latency {sum(self.preemption_latency) / len(self.preemption_latency):.1f}s avg over {len(self.preemption_latency)}"
+            logs.logger.info(message)
+
+    def _record_deadline(self, task, deadline, now, duration):
+        kind = type(task).__name__
+        window = self.deadline_lateness.setdefault(kind, deque(maxlen=200))
+        late = now - deadline
+        window.append(late)
+        name = getattr(task, "name", "")
+        previous = self.service_time.get(name)
+        self.service_time[name] = duration if previous is None else previous * 0.7 + duration * 0.3
+
+        if isinstance(task, stations.pego_station):
+            missed = sum(1 for value in window if value > 0)
+            logs.logger.info(f"pego deadlines: {late:+.0f}s this run | {missed}/{len(window)} started after the estimated cap")
+
+        # share of the bots time every station needs, over 1.0 means one bot cant keep up
+        tasks = {getattr(entry[3], "name", ""): entry[3] for entry in self.waiting_queue.snapshot() + self.active_queue.snapshot()}
+        tasks[name] = task
+        load = 0.0
+        for task_name, queued in tasks.items():
+            period = float(queued.get_requeue_delay() or 0)
+            if period > 0 and task_name in self.service_time:
+                load += self.service_time[task_name] / period
+        if load > 1.0 and now - self._last_overload_warning > 3600:
+            self._last_overload_warning = now
+            logs.logger.warning(f"stations need {load:.0%} of the bots time, deadlines will be missed with this many stations")
+        else:
+            logs.logger.debug(f"scheduler load {load:.0%}")
+
     def execute_task(self, current_time):
-        task_tuple = self.active_queue.pop()
+        task_tuple = self.active_queue.pop_by(self._edf_key) if self._edf() else self.active_queue.pop()
         if not task_tuple:
             return
 
@@ -287,17 +426,51 @@ class task_scheduler(metaclass=SingletonMeta):
         if getattr(task, "name", "") != self.prev_task_name:
             logs.logger.info(f"Executing task: {getattr(task, 'name', '<unnamed>')}")
 
+        if getattr(task, "resume_from", None) is None: # a resumed task was already counted when it first started
+            self._record_lateness(task, exec_time, time.time())
+        started = time.time()
+        deadline = self.deadline_of(task, exec_time) # before the run, a pego pickup moves its own deadline
+        task.preempt_check = self.preempt_check
+        task.next_due = self.next_due
+        task.pull_forward = self.pull_forward
+        aborted = False
+        preempted = False
         try:
+            seed_planner.before_task(task)
+            deposit_batch.flush_for(task) # anything batched gets deposited before a task that would drop it
             task.execute()
+        except stations.TaskPreempted:
+            # higher priority work is due, this task goes back on the active queue and resumes from its checkpoint
+            aborted = True
+            preempted = True
+        except health_watcher.GameUnhealthyError as e:
+            # game went down mid task, recover now and run the same task again straight after
+            aborted = True
+            logs.logger.error(f"Task {getattr(task, 'name', '<unnamed>')} aborted: {e}")
+            try:
+                ASA.player.player_state.recover_connection(f"{e.state} during {getattr(task, 'name', '<unnamed>')}")
+            except Exception as recovery_error:
+                logs.logger.exception(f"recovery after {e.state} failed: {recovery_error}")
         except Exception as e:
             logs.logger.exception(f"Task {getattr(task, 'name', '<unnamed>')} raised: {e}")
         finally:
+            if not preempted and getattr(task, "resume_from", None) is not None:
+                task.resume_from = None # only a preempted run may skip steps next time, anything else starts over
             try:
                 logs.clear_task_context()
             except Exception:
                 pass
+            latency.report()
+            predicate_memo.report()
+            aim_corrections.report()
+
+        if aborted:
+            self.active_queue.add(task, priority, time.time())
+            self.prev_task_name = ""
+            return
 
         now = time.time()
+        self._record_deadline(task, deadline, started, now - started)
 
         # If a watchdog task just ran, reset tracking and DO NOT run cycle logic for this execution.
         if isinstance(task, watchdog_render_task):
@@ -365,7 +538,8 @@ class task_scheduler(metaclass=SingletonMeta):
             self.move_to_waiting_queue(task)
 
     def move_to_waiting_queue(self, task):
-        next_execution_time = time.time() + float(task.get_requeue_delay() or 0)
+        delay = float(task.get_requeue_delay() or 0)
+        next_execution_time = time.time() + station_health.requeue_delay(getattr(task, "name", ""), delay) # quarantined stations wait out their backoff
         priority_level = task.get_priority_level()
         self.waiting_queue.add(task, priority_level, next_execution_time)
 
@@ -401,6 +575,8 @@ def main():
     global scheduler
     global started
     scheduler = task_scheduler()
+    screen_monitor.start()
+    health_watcher.start()
 
     # Expose basic stats to the Discord log panel (read-only).
     scheduler.started_at = time.time()
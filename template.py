@@ -5,7 +5,13 @@ import logs.gachalogs as logs
 import settings
 import time
 import ASA.player.console
+import ASA.config
+import ASA.player.state_cache
+import predicate_memo
+import health_watcher
+import latency
 import json
+import os
 
 
 
@@ -41,25 +47,95 @@ roi_regions = {
     "access_inv":{"start_x":550, "start_y":450 ,"width":1670 ,"height":880},
     "auto_stack": {"start_x": 2137, "start_y": 175, "width": 182, "height": 125},
     "auto_stack_icon": {"start_x": 2137, "start_y": 175, "width": 182, "height": 125},
+    "player_grid": {"start_x": 200, "start_y": 290, "width": 770, "height": 900},
+    "object_grid": {"start_x": 1630, "start_y": 290, "width": 770, "height": 900},
+    "teleporter_list": {"start_x": 200, "start_y": 250, "width": 800, "height": 950},
+    "spawn_button": {"start_x": 2000, "start_y": 1250, "width": 400, "height": 100},
+    # always visible hud vitals (bottom right) the bars fill from the bottom up. placeholder positions, not yet calibrated against 1440p captures (settings.hud_vitals_enabled stays off until they are)
+    "hud_food": {"start_x": 2472, "start_y": 1186, "width": 40, "height": 52},
+    "hud_water": {"start_x": 2472, "start_y": 1240, "width": 40, "height": 52},
+    "tek_pod_xp": {"start_x": 1000, "start_y": 1100, "width": 560, "height": 200},
 }
-def template_await_true(func,sleep_amount:float,*args) -> bool:
+def template_await_true(func,sleep_amount:float,*args,action:str = None) -> bool:
+    """action records how long func took to turn True in the latency model, timeouts are not recorded"""
     count = 0 
-    while func(*args) == False:
-        if count >= sleep_amount * 20 : 
-            break    
-        time.sleep(0.05)
-        count += 1
-    return func(*args)
-
-def template_await_false(func,sleep_amount:float,*args) -> bool:
+    start = time.time()
+    with predicate_memo.fresh(): # waiting on the screen to change by itself so every poll has to look again
+        while func(*args) == False:
+            if count >= sleep_amount * 20 : 
+                ASA.player.state_cache.note_timeout(sleep_amount, getattr(func, "__name__", "await"))
+                return func(*args)
+            health_watcher.raise_if_unhealthy()
+            time.sleep(0.05)
+            count += 1
+        if action:
+            latency.record(action, time.time() - start)
+        return func(*args)
+
+def template_await_false(func,sleep_amount:float,*args,action:str = None) -> bool:
+    """action records how long func took to turn False in the latency model, timeouts are not recorded"""
     count = 0 
-    while func(*args) == True:
-        if count >= sleep_amount * 20 : 
-            break    
-        time.sleep(0.05)
-        count += 1
-    return func(*args)
-
+    start = time.time()
+    with predicate_memo.fresh():
+        while func(*args) == True:
+            if count >= sleep_amount * 20 : 
+                ASA.player.state_cache.note_timeout(sleep_amount, getattr(func, "__name__", "await"))
+                return func(*args)
+            health_watcher.raise_if_unhealthy()
+            time.sleep(0.05)
+            count += 1
+        if action:
+            latency.record(action, time.time() - start)
+        return func(*args)
+
+def await_settled(item:str, max_wait:float, action:str = None) -> bool:
+    """
+    waits until the roi has changed and then stops changing instead of sleeping a fixed amount after a click
+    returns True once the roi changed and ASA.config.settle_stable_frames frames in a row after that differ by less than ASA.config.settle_threshold
+    returns False when nothing changed within ASA.config.settle_change_seconds (the click had nothing to move) or max_wait runs out
+    """
+    region = roi_regions[item]
+    start = time.time()
+    change_wait = min(max_wait, ASA.config.settle_change_seconds*settings.lag_offset)
+    time.sleep(ASA.config.settle_min_seconds) # give the ui a moment to react to the click
+    previous = None
+    changed = False
+    stable = 0
+    while True:
+        roi = screen.get_screen_roi(region["start_x"], region["start_y"], region["width"], region["height"])
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGRA2GRAY)
+        small = cv2.resize(gray, (0, 0), fx=0.25, fy=0.25, interpolation=cv2.INTER_AREA).astype(np.int16)
+        if previous is not None:
+            diff = float(np.mean(np.abs(small - previous)))
+            if diff > ASA.config.settle_threshold:
+                changed = True
+                stable = 0
+            elif changed:
+                stable += 1
+            if stable >= ASA.config.settle_stable_frames:
+                elapsed = time.time() - start
+                logs.logger.template(f"{item} settled after {elapsed:.3f}s")
+                latency.record(action or f"settle_{item}", elapsed)
+                return True
+        previous = small
+        if not changed and time.time() - start >= change_wait:
+            logs.logger.template(f"{item} did not change within {change_wait:.3f}s")
+            return False
+        if time.time() - start >= max_wait:
+            logs.logger.template(f"{item} did not settle within {max_wait:.3f}s")
+            return False
+        time.sleep(ASA.config.settle_poll_seconds)
+
+_icon_exists = {}
+
+def has_icon(item:str) -> bool:
+    """True if the icon for item exists at the current resolution, lets optional checks fall back when it hasnt been captured"""
+    key = (item, screen.screen_resolution)
+    if key not in _icon_exists:
+        _icon_exists[key] = os.path.exists(f"icons{screen.screen_resolution}/{item}.png")
+    return _icon_exists[key]
+
+@predicate_memo.memoized
 def check_template(item:str, threshold:float) -> bool:
     region = roi_regions[item]
     if screen.screen_resolution == 1440:
@@ -90,6 +166,51 @@ def check_template(item:str, threshold:float) -> bool:
     logs.logger.template(f"{item} not found:{max_val} threshold:{threshold}")
     return False
 
+def occupied_slots(item:str, first_x:int, first_y:int, distance:int, columns:int, rows:int, min_std:float) -> int:
+    """counts inventory slots in the item region that arent empty, a slot counts as used when its grey level varies more than min_std"""
+    region = roi_regions[item]
+    roi = screen.get_screen_roi(region["start_x"], region["start_y"], region["width"], region["height"])
+    gray = cv2.cvtColor(roi, cv2.COLOR_BGRA2GRAY)
+    scale = gray.shape[1] / region["width"]
+    size = int(distance * 0.8 * scale)
+    count = 0
+    for row in range(rows):
+        for column in range(columns):
+            x = int((first_x - region["start_x"] + column * distance) * scale)
+            y = int((first_y - region["start_y"] + row * distance) * scale)
+            slot = gray[y:y + size, x:x + size]
+            if slot.size and float(np.std(slot)) > min_std:
+                count += 1
+    logs.logger.template(f"{item} has {count} / {columns * rows} slots used")
+    return count
+
+def check_frame(frame, region:dict, item:str, threshold:float, lower=(0,30,200), upper=(255,255,255)) -> bool:
+    """check_template against a frame from screen.grab_client() so several checks share one capture"""
+    roi = screen.crop(frame, region["start_x"], region["start_y"], region["width"], region["height"])
+    lower_boundary = np.array(lower)
+    upper_boundary = np.array(upper)
+
+    hsv = cv2.cvtColor(roi,cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv,lower_boundary,upper_boundary)
+    masked_template = cv2.bitwise_and(roi, roi, mask= mask)
+    gray_roi = cv2.cvtColor(masked_template, cv2.COLOR_BGR2GRAY)
+
+    image = cv2.imread(f"icons{screen.screen_resolution}/{item}.png")
+    hsv = cv2.cvtColor(image,cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv,lower_boundary,upper_boundary)
+    masked_template = cv2.bitwise_and(image, image, mask=mask)
+    image = cv2.cvtColor(masked_template,cv2.COLOR_BGR2GRAY)
+
+    res = cv2.matchTemplate(gray_roi, image, cv2.TM_CCOEFF_NORMED)
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+
+    if max_val > threshold:
+        logs.logger.template(f"{item} found in frame:{max_val}")
+        return True
+    logs.logger.template(f"{item} not found in frame:{max_val} threshold:{threshold}")
+    return False
+
+@predicate_memo.memoized
 def check_template_no_bounds(item:str, threshold:float) -> bool:
     region = roi_regions[item]
     if screen.screen_resolution == 1440:
@@ -211,6 +332,7 @@ def inventory_first_slot(item:str,threshold:float) -> bool:
     logs.logger.template(f"{item} not found:{max_val} threshold:{threshold}")
     return False
 
+@predicate_memo.memoized
 def check_buffs(buff,threshold):
     region = roi_regions["player_stats"]
     if screen.screen_resolution == 1440:
@@ -241,6 +363,23 @@ def check_buffs(buff,threshold):
     logs.logger.template(f"{buff} not found:{max_val} threshold:{threshold}")
     return False
 
+def hud_bar_fill(item:str, lower:tuple, upper:tuple, min_pixels:int):
+    """
+    fraction (0-1) of the hud bar in roi item that is filled, counted as the rows where at least half the pixels are in the fill colour
+    returns None when fewer than min_pixels match at all (hud hidden behind a menu or the bar is empty) so callers fall back to the buff panel
+    """
+    region = roi_regions[item]
+    roi = screen.get_screen_roi(region["start_x"], region["start_y"], region["width"], region["height"])[:, :, :3]
+    hsv = cv2.cvtColor(roi,cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv,np.array(lower),np.array(upper)) > 0
+    if int(mask.sum()) < min_pixels:
+        logs.logger.template(f"{item} unreadable only {int(mask.sum())} fill pixels")
+        return None
+    filled_rows = mask.mean(axis=1) >= 0.5
+    fill = float(filled_rows.mean())
+    logs.logger.template(f"{item} fill:{fill:.2f}")
+    return fill
+
 def check_teleporter_orange():
     region = roi_regions["orange"]
     if screen.screen_resolution == 1440:
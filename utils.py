@@ -5,6 +5,7 @@ import windows
 import logs.gachalogs as logs
 import ASA.player.console
 import ASA.player.player_state
+import health_watcher
 """
 FUNCTIONS FOR KEYBOARD 
 """
@@ -49,14 +50,17 @@ def keymap_return(key_input):
         return vk_code
 
 def press_key(input_action):
+    health_watcher.raise_if_unhealthy()
     vk_code = keymap_return(local_player.get_input_settings(input_action))
 
     ctypes.windll.user32.PostMessageW(hwnd, WM_KEYDOWN , vk_code, 0)
     time.sleep(0.05)
     ctypes.windll.user32.PostMessageW(hwnd, WM_KEYUP , vk_code, 0)
+    windows.bump_epoch()
 
 def post_charecter(char):
     ctypes.windll.user32.PostMessageW(hwnd, WM_CHAR, ord(char), 0)
+    windows.bump_epoch()
 
 def write(text):
     for c in text:
@@ -71,6 +75,7 @@ def ctrl_a(): # hotkey for sending ctrl a
     ctypes.windll.user32.SendMessageW(windows.hwnd, WM_KEYUP, 0x41, 0)
     time.sleep(0.1)
     ctypes.windll.user32.SendMessageW(windows.hwnd, WM_KEYUP, 0x11, 0)
+    windows.bump_epoch()
 """
 FUNCTIONS FOR MOUSE MOVEMENT
 """
@@ -86,11 +91,13 @@ def normalize_yaw(yaw):
         yaw -= 360
     return yaw 
 
-def set_yaw(yaw):
+def set_yaw(yaw, ccc_data = None):
     global current_yaw
     try:
-        logs.logger.debug(f"setting yaw as {float(ASA.player.console.console_ccc()[3])}")
-        current_yaw = float(ASA.player.console.console_ccc()[3])
+        if ccc_data == None:
+            ccc_data = ASA.player.console.console_ccc() # one ccc round trip is enough for both the log and the value
+        current_yaw = float(ccc_data[3])
+        logs.logger.debug(f"setting yaw as {current_yaw}")
     except Exception as e:
         logs.logger.error(f"error processing ccc_data[3]: {e}")
 
@@ -161,6 +168,17 @@ def turn_left(degrees):
     current_yaw = normalize_yaw(current_yaw + (-degrees))
     
 
+def turn_by(yaw, pitch):
+    """turns by a signed yaw (right positive) and pitch (up positive) offset"""
+    if yaw > 0:
+        turn_right(yaw)
+    elif yaw < 0:
+        turn_left(-yaw)
+    if pitch > 0:
+        turn_up(pitch)
+    elif pitch < 0:
+        turn_down(-pitch)
+
 def turn_down(degrees):
     global current_pitch
     allowed = min(abs(player_pitch_minimum - current_pitch), degrees)
@@ -9,6 +9,15 @@ def find_window_by_title(title):
 
 hwnd = find_window_by_title("ArkAscended") 
 
+# bumped by every input we send so anything read off the screen before it can be told apart from after
+input_epoch = 0
+last_input_time = 0.0
+
+def bump_epoch():
+    global input_epoch, last_input_time
+    input_epoch += 1
+    last_input_time = time.time()
+
 INPUT_MOUSE = 0
 MOUSEEVENTF_MOVE = 0x0001
 MOUSEEVENTF_MOVE_NOCOALESCE = 0x2000
@@ -58,6 +67,7 @@ def turn(x: int, y: int):
         dwExtraInfo=0,
     )
     ctypes.windll.user32.SendInput(1, ctypes.byref(input_event), ctypes.sizeof(INPUT))
+    bump_epoch()
 
 
 WM_LBUTTONDOWN = 0x0201
@@ -79,8 +89,10 @@ def move_mouse(x, y):
     """
     dx, dy = screen.client_to_desktop(int(x), int(y))
     ctypes.windll.user32.SetCursorPos(dx, dy)
+    bump_epoch()
 
 def click(x, y):
     lparam = (y << 16) | x
     ctypes.windll.user32.PostMessageW(hwnd, WM_LBUTTONDOWN, 0, lparam)
     ctypes.windll.user32.PostMessageW(hwnd, WM_LBUTTONUP, 0, lparam)
+    bump_epoch()